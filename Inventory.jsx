@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card.jsx'
 import { Button } from '@/components/ui/button.jsx'
 import { Input } from '@/components/ui/input.jsx'
@@ -16,6 +16,7 @@ export default function Inventory({ user, token }) {
   const [showAddForm, setShowAddForm] = useState(false)
   const [editingItem, setEditingItem] = useState(null)
   const [stats, setStats] = useState({})
+  const syncCursor = useRef(null)
 
   // Form state for adding/editing items
   const [formData, setFormData] = useState({
@@ -39,12 +40,25 @@ export default function Inventory({ user, token }) {
   useEffect(() => {
     fetchInventory()
     fetchStats()
+
+    // Pick up changes made on other devices when the tab regains focus
+    const handleFocus = () => {
+      fetchInventory()
+      fetchStats()
+    }
+    window.addEventListener('focus', handleFocus)
+    return () => window.removeEventListener('focus', handleFocus)
   }, [])
 
+  // Fetches only the items changed or deleted since the last sync; the first call returns everything
   const fetchInventory = async () => {
     try {
-      setLoading(true)
-      const response = await fetch('/api/inventory', {
+      const params = new URLSearchParams({ include: 'inventory_items' })
+      if (syncCursor.current) {
+        params.set('since', syncCursor.current)
+      }
+
+      const response = await fetch(`/api/sync?${params}`, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
@@ -53,7 +67,15 @@ export default function Inventory({ user, token }) {
 
       if (response.ok) {
         const data = await response.json()
-        setItems(data.items || [])
+        const { changed, deleted } = data.inventory_items
+        setItems(prevItems => {
+          if (data.full) return changed
+          const itemsById = new Map(prevItems.map(item => [item.id, item]))
+          deleted.forEach(id => itemsById.delete(id))
+          changed.forEach(item => itemsById.set(item.id, item))
+          return Array.from(itemsById.values())
+        })
+        syncCursor.current = data.cursor
       } else {
         setError('Failed to fetch inventory')
       }
@@ -66,7 +88,7 @@ export default function Inventory({ user, token }) {
 
   const fetchStats = async () => {
     try {
-      const response = await fetch('/api/inventory/stats', {
+      const response = await fetch('/api/inventory/summary', {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json'
@@ -463,6 +485,16 @@ export default function Inventory({ user, token }) {
                 return (
                   <Card key={item.id} className="relative">
                     <CardContent className="p-4">
+                      {item.thumbnail_url && (
+                        <img
+                          src={item.thumbnail_url}
+                          alt={item.name}
+                          loading="lazy"
+                          width={200}
+                          height={200}
+                          className="w-full h-32 object-cover rounded-md mb-3"
+                        />
+                      )}
                       <div className="flex items-start justify-between mb-2">
                         <h3 className="font-semibold">{item.name}</h3>
                         <div className="flex gap-1">
@@ -12,6 +12,9 @@ export default function Recipes({ user, token }) {
   const [recipes, setRecipes] = useState([])
   const [suggestions, setSuggestions] = useState([])
   const [favorites, setFavorites] = useState([])
+  const [alternatives, setAlternatives] = useState([])
+  const [forYou, setForYou] = useState([])
+  const [similarRecipes, setSimilarRecipes] = useState([])
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
   const [searchTerm, setSearchTerm] = useState('')
@@ -35,9 +38,37 @@ export default function Recipes({ user, token }) {
       fetchSuggestions()
     } else if (activeTab === 'favorites') {
       fetchFavorites()
+    } else if (activeTab === 'for-you') {
+      fetchForYou()
     }
   }, [activeTab, filters, searchTerm])
 
+  useEffect(() => {
+    if (selectedRecipe) {
+      fetchSimilarRecipes(selectedRecipe.id)
+    } else {
+      setSimilarRecipes([])
+    }
+  }, [selectedRecipe])
+
+  const fetchSimilarRecipes = async (recipeId) => {
+    try {
+      const response = await fetch(`/api/recipes/${recipeId}/similar`, {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json'
+        }
+      })
+
+      if (response.ok) {
+        const data = await response.json()
+        setSimilarRecipes(data.similar || [])
+      }
+    } catch (err) {
+      console.error('Error fetching similar recipes:', err)
+    }
+  }
+
   const fetchRecipes = async () => {
     try {
       setLoading(true)
@@ -121,6 +152,7 @@ export default function Recipes({ user, token }) {
       if (response.ok) {
         const data = await response.json()
         setFavorites(data.favorites || [])
+        setAlternatives(data.alternatives || [])
       } else {
         setError('Failed to fetch favorites')
         // Use mock data for demonstration
@@ -135,6 +167,31 @@ export default function Recipes({ user, token }) {
     }
   }
 
+  const fetchForYou = async () => {
+    try {
+      setLoading(true)
+      setError('')
+
+      const response = await fetch('/api/recipes/for-you', {
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json'
+        }
+      })
+
+      if (response.ok) {
+        const data = await response.json()
+        setForYou(data.recipes || [])
+      } else {
+        setError('Failed to fetch recommendations')
+      }
+    } catch (err) {
+      setError('Error loading recommendations: ' + err.message)
+    } finally {
+      setLoading(false)
+    }
+  }
+
   const toggleFavorite = async (recipeId) => {
     try {
       const response = await fetch(`/api/recipes/${recipeId}/favorite`, {
@@ -294,6 +351,16 @@ export default function Recipes({ user, token }) {
   const RecipeCard = ({ recipe, showMatch = false }) => (
     <Card className="cursor-pointer hover:shadow-lg transition-shadow" onClick={() => setSelectedRecipe(recipe)}>
       <CardContent className="p-4">
+        {recipe.thumbnail_url && (
+          <img
+            src={recipe.thumbnail_url}
+            alt={recipe.name}
+            loading="lazy"
+            width={200}
+            height={200}
+            className="w-full h-32 object-cover rounded-md mb-3"
+          />
+        )}
         <div className="flex items-start justify-between mb-2">
           <h3 className="font-semibold text-lg">{recipe.name}</h3>
           <Button
@@ -458,6 +525,17 @@ export default function Recipes({ user, token }) {
             Add to Meal Plan
           </Button>
         </div>
+
+        {similarRecipes.length > 0 && (
+          <div className="mt-6">
+            <h3 className="font-semibold mb-3">Similar Recipes</h3>
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+              {similarRecipes.map(similar => (
+                <RecipeCard key={similar.id} recipe={similar} />
+              ))}
+            </div>
+          </div>
+        )}
       </CardContent>
     </Card>
   )
@@ -481,7 +559,7 @@ export default function Recipes({ user, token }) {
       </Card>
 
       <Tabs value={activeTab} onValueChange={setActiveTab}>
-        <TabsList className="grid w-full grid-cols-3">
+        <TabsList className="grid w-full grid-cols-4">
           <TabsTrigger value="browse" className="flex items-center">
             <Search className="h-4 w-4 mr-2" />
             Browse
@@ -490,6 +568,10 @@ export default function Recipes({ user, token }) {
             <Lightbulb className="h-4 w-4 mr-2" />
             Suggestions
           </TabsTrigger>
+          <TabsTrigger value="for-you" className="flex items-center">
+            <TrendingUp className="h-4 w-4 mr-2" />
+            For You
+          </TabsTrigger>
           <TabsTrigger value="favorites" className="flex items-center">
             <Star className="h-4 w-4 mr-2" />
             Favorites
@@ -635,6 +717,27 @@ export default function Recipes({ user, token }) {
           )}
         </TabsContent>
 
+        <TabsContent value="for-you" className="space-y-4">
+          {loading ? (
+            <div className="text-center py-8">
+              <TrendingUp className="h-8 w-8 mx-auto mb-2 animate-pulse" />
+              <p>Loading recommendations...</p>
+            </div>
+          ) : forYou.length === 0 ? (
+            <div className="text-center py-8 text-gray-500">
+              <TrendingUp className="h-12 w-12 mx-auto mb-4 opacity-50" />
+              <p>No recommendations yet</p>
+              <p className="text-sm mt-2">Favorite and rate recipes to personalize this list</p>
+            </div>
+          ) : (
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+              {forYou.map(recipe => (
+                <RecipeCard key={recipe.id} recipe={recipe} />
+              ))}
+            </div>
+          )}
+        </TabsContent>
+
         <TabsContent value="favorites" className="space-y-4">
           {loading ? (
             <div className="text-center py-8">
@@ -654,6 +757,17 @@ export default function Recipes({ user, token }) {
               ))}
             </div>
           )}
+
+          {!loading && alternatives.length > 0 && (
+            <div>
+              <h3 className="font-semibold mb-3">You Might Also Like</h3>
+              <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
+                {alternatives.map(recipe => (
+                  <RecipeCard key={recipe.id} recipe={recipe} />
+                ))}
+              </div>
+            </div>
+          )}
         </TabsContent>
       </Tabs>
 
@@ -107,7 +107,8 @@ export default function Scanner({ user, token }) {
           quantity: item.quantity || 1,
           unit: item.unit || 'piece',
           freshness_score: item.freshness_score,
-          expiry_date: item.estimated_expiry
+          expiry_date: item.estimated_expiry,
+          image_url: item.image_url
         })
       })
 
@@ -123,6 +124,38 @@ export default function Scanner({ user, token }) {
     }
   }
 
+  const addAllToInventory = async (items) => {
+    try {
+      // One round trip for the whole scan; the server fills in expiry estimates
+      const response = await fetch('/api/inventory/bulk', {
+        method: 'POST',
+        headers: {
+          'Authorization': `Bearer ${token}`,
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+          create: items.map(item => ({
+            name: item.name,
+            category: item.category,
+            quantity: item.quantity || 1,
+            unit: item.unit || 'piece',
+            freshness_score: item.freshness_score,
+            expiry_date: item.estimated_expiry
+          }))
+        })
+      })
+
+      const data = await response.json()
+      if (response.ok) {
+        alert(`${data.created} items added to inventory!`)
+      } else {
+        setError(data.error || 'Failed to add items to inventory')
+      }
+    } catch (error) {
+      setError('Network error. Please try again.')
+    }
+  }
+
   return (
     <div className="space-y-6">
       {/* Scanner Mode Selection */}
@@ -313,6 +346,14 @@ export default function Scanner({ user, token }) {
                           </div>
                         ))}
                       </div>
+
+                      <Button
+                        onClick={() => addAllToInventory(scanResult.items)}
+                        className="w-full"
+                      >
+                        <Package className="h-4 w-4 mr-2" />
+                        Add All to Inventory
+                      </Button>
                       
                       {scanResult.recipes && scanResult.recipes.length > 0 && (
                         <div className="space-y-2">
@@ -0,0 +1,56 @@
+from flask import Blueprint, jsonify, request, current_app, send_from_directory
+from functools import wraps
+from datetime import datetime
+import io
+import os
+import pstats
+from src.profiling import PROFILE_HEADER, PROFILE_NAME_RE, is_valid_token, list_profiles, profile_dir, tokens_enabled
+
+admin_bp = Blueprint('admin', __name__)
+
+def profile_token_required(fn):
+    """Require a valid signed X-Profile-Token header; the endpoints don't exist without PROFILING_SECRET"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not tokens_enabled(current_app):
+            return jsonify({'error': 'Not found'}), 404
+        if not is_valid_token(current_app, request.headers.get(PROFILE_HEADER)):
+            return jsonify({'error': 'Invalid or missing profile token'}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+@admin_bp.route('/admin/profiles', methods=['GET'])
+@profile_token_required
+def get_profiles():
+    """List stored request profiles, newest first"""
+    try:
+        profiles = list_profiles(current_app)
+        for profile in profiles:
+            profile['created_at'] = datetime.utcfromtimestamp(profile['created_at']).isoformat()
+
+        return jsonify({
+            'profiles': profiles,
+            'total': len(profiles)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/admin/profiles/<name>', methods=['GET'])
+@profile_token_required
+def get_profile(name):
+    """Download a stored profile, or ?format=text for a pstats summary"""
+    try:
+        if not PROFILE_NAME_RE.match(name) or not os.path.exists(os.path.join(profile_dir(current_app), name)):
+            return jsonify({'error': 'Profile not found'}), 404
+
+        if request.args.get('format') == 'text':
+            output = io.StringIO()
+            stats = pstats.Stats(os.path.join(profile_dir(current_app), name), stream=output)
+            stats.sort_stats(request.args.get('sort', 'cumulative')).print_stats(request.args.get('limit', 40, type=int))
+            return current_app.response_class(output.getvalue(), mimetype='text/plain')
+
+        return send_from_directory(profile_dir(current_app), name, as_attachment=True)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,198 @@
+"""Move finished rows out of the hot per-user tables.
+
+* inventory items expired for more than ``--expired-days``, or used up (quantity 0)
+* shopping lists completed more than ``--completed-days`` ago
+* meal plans that ended more than ``--completed-days`` ago
+* sync tombstones older than their retention
+* stored photos no inventory item or recipe points at, ``--image-grace-days``
+  after they were last uploaded or scanned
+
+Each batch is one short transaction followed by ``--pause`` seconds of sleep,
+so the job can run beside live traffic. Rows are deleted through the ORM, so
+inventory summaries and sync tombstones stay correct. Run it from cron:
+
+    flask --app src.main archive-data --batch-size 500 --pause 0.2
+"""
+import json
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import or_
+
+from src.models.user import db
+from src.models.inventory import InventoryItem
+from src.models.recipe import Recipe
+from src.models.preferences import MealPlan, ShoppingList
+from src.models.archive import ArchivedInventoryItem, ArchivedMealPlan, ArchivedShoppingList
+from src.models.loading import meal_plans_with_items, shopping_lists_with_items
+from src.models.tombstone import Tombstone, TOMBSTONE_RETENTION_DAYS
+from src.image_store import IMAGE_URL_PREFIX, get_image_store, url_digest
+
+ARCHIVE_EXPIRED_AFTER_DAYS = 14
+ARCHIVE_COMPLETED_AFTER_DAYS = 30
+# Time for a client to attach a scanned photo to an item before it counts as unused
+IMAGE_GRACE_DAYS = 7
+
+
+def archive_inventory_item(item, now):
+    return ArchivedInventoryItem(
+        original_id=item.id,
+        user_id=item.user_id,
+        name=item.name,
+        category=item.category,
+        quantity=item.quantity,
+        unit=item.unit,
+        purchase_date=item.purchase_date,
+        expiry_date=item.expiry_date,
+        location=item.location,
+        created_at=item.created_at,
+        reason='consumed' if item.quantity <= 0 else 'expired',
+        archived_at=now
+    )
+
+
+def archive_meal_plan(plan, now):
+    return ArchivedMealPlan(
+        original_id=plan.id,
+        user_id=plan.user_id,
+        name=plan.name,
+        start_date=plan.start_date,
+        end_date=plan.end_date,
+        meal_items=json.dumps(plan.to_dict(include_items=True)['meal_items']),
+        created_at=plan.created_at,
+        archived_at=now
+    )
+
+
+def archive_shopping_list(shopping_list, now):
+    return ArchivedShoppingList(
+        original_id=shopping_list.id,
+        user_id=shopping_list.user_id,
+        name=shopping_list.name,
+        items=json.dumps(shopping_list.to_dict(include_items=True)['items']),
+        created_at=shopping_list.created_at,
+        completed_at=shopping_list.updated_at,
+        archived_at=now
+    )
+
+
+def archive_in_batches(model, condition, to_archive, batch_size, pause, max_batches=0, options=()):
+    """Archive and delete rows of ``model`` matching ``condition``, one transaction per batch"""
+    last_id = 0
+    archived = batches = 0
+
+    while not max_batches or batches < max_batches:
+        rows = model.query.options(*options).filter(condition, model.id > last_id).order_by(model.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        now = datetime.utcnow()
+        for row in rows:
+            db.session.add(to_archive(row, now))
+            db.session.delete(row)
+        db.session.commit()
+
+        archived += len(rows)
+        batches += 1
+        last_id = rows[-1].id
+
+        if pause:
+            time.sleep(pause)
+
+    return archived
+
+
+def purge_tombstones(batch_size, pause, max_batches=0):
+    """Delete sync tombstones older than the retention window"""
+    cutoff = datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    purged = batches = 0
+
+    while not max_batches or batches < max_batches:
+        ids = [row.id for row in db.session.query(Tombstone.id).filter(
+            Tombstone.deleted_at < cutoff
+        ).order_by(Tombstone.id).limit(batch_size)]
+        if not ids:
+            break
+
+        Tombstone.query.filter(Tombstone.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+        purged += len(ids)
+        batches += 1
+
+        if pause:
+            time.sleep(pause)
+
+    return purged
+
+
+def referenced_image_digests():
+    """Digests of stored images that a live inventory item or recipe points at"""
+    digests = set()
+    for model in (InventoryItem, Recipe):
+        urls = db.session.query(model.image_url).filter(model.image_url.startswith(IMAGE_URL_PREFIX))
+        for (url,) in urls.yield_per(1000):
+            digest = url_digest(url)
+            if digest:
+                digests.add(digest)
+    return digests
+
+
+def sweep_images(grace_days=IMAGE_GRACE_DAYS):
+    """Delete stored images nothing references, once they are past the grace period"""
+    # References are read first. A photo attached after this read was scanned or uploaded moments before,
+    # so its recent mtime keeps it out of this sweep
+    referenced = referenced_image_digests()
+    return get_image_store().sweep(referenced, grace_days * 86400)
+
+
+def run_archival(batch_size=500, pause=0.2, expired_days=ARCHIVE_EXPIRED_AFTER_DAYS,
+                 completed_days=ARCHIVE_COMPLETED_AFTER_DAYS, max_batches=0, image_grace_days=IMAGE_GRACE_DAYS):
+    """Run every archival pass; return counts per table"""
+    now = datetime.utcnow()
+    expired_before = now - timedelta(days=expired_days)
+    completed_before = now - timedelta(days=completed_days)
+
+    return {
+        'inventory_items': archive_in_batches(
+            InventoryItem,
+            or_(InventoryItem.expiry_date < expired_before, InventoryItem.quantity <= 0),
+            archive_inventory_item, batch_size, pause, max_batches
+        ),
+        'shopping_lists': archive_in_batches(
+            ShoppingList,
+            ShoppingList.is_completed.is_(True) & (ShoppingList.updated_at < completed_before),
+            archive_shopping_list, batch_size, pause, max_batches,
+            options=shopping_lists_with_items()
+        ),
+        'meal_plans': archive_in_batches(
+            MealPlan,
+            MealPlan.end_date < completed_before.date(),
+            archive_meal_plan, batch_size, pause, max_batches,
+            options=meal_plans_with_items()
+        ),
+        'tombstones': purge_tombstones(batch_size, pause, max_batches),
+        # Last, so photos of items archived above are swept too
+        'images': sweep_images(image_grace_days)
+    }
+
+
+@click.command('archive-data')
+@click.option('--batch-size', default=500, show_default=True, help='Rows per transaction.')
+@click.option('--pause', default=0.2, show_default=True, help='Seconds to sleep between batches.')
+@click.option('--expired-days', default=ARCHIVE_EXPIRED_AFTER_DAYS, show_default=True,
+              help='Archive inventory items this many days after they expire.')
+@click.option('--completed-days', default=ARCHIVE_COMPLETED_AFTER_DAYS, show_default=True,
+              help='Archive completed shopping lists and past meal plans after this many days.')
+@click.option('--max-batches', default=0, show_default=True, help='Stop each pass after this many batches (0 = no limit).')
+@click.option('--image-grace-days', default=IMAGE_GRACE_DAYS, show_default=True,
+              help='Delete unreferenced stored photos this many days after their last upload or scan.')
+@with_appcontext
+def archive_data_command(batch_size, pause, expired_days, completed_days, max_batches, image_grace_days):
+    """Move expired inventory and finished plans into the archive tables."""
+    counts = run_archival(batch_size, pause, expired_days, completed_days, max_batches, image_grace_days)
+    current_app.logger.info('Archival finished: %s', counts)
+    click.echo(', '.join(f'{name}: {count}' for name, count in counts.items()))
@@ -0,0 +1,102 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+import json
+from src.models.user import db
+
+class ArchivedInventoryItem(db.Model):
+    """Inventory item moved out of the hot table once expired or used up; kept for waste tracking"""
+    id = db.Column(db.Integer, primary_key=True)
+    # id of the original InventoryItem. Not unique: SQLite reuses the ids of deleted rows,
+    # so a new item can get an archived item's id and later be archived too
+    original_id = db.Column(db.Integer, nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    quantity = db.Column(db.Float, nullable=False)
+    unit = db.Column(db.String(20), nullable=False)
+    purchase_date = db.Column(db.DateTime, nullable=False)
+    expiry_date = db.Column(db.DateTime, nullable=True)
+    location = db.Column(db.String(50), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    reason = db.Column(db.String(20), nullable=False)  # expired, consumed
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_archived_inventory_item_user_archived', 'user_id', 'archived_at'),
+    )
+
+    def __repr__(self):
+        return f'<ArchivedInventoryItem {self.name} ({self.reason})>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'original_id': self.original_id,
+            'user_id': self.user_id,
+            'name': self.name,
+            'category': self.category,
+            'quantity': self.quantity,
+            'unit': self.unit,
+            'purchase_date': self.purchase_date.isoformat() if self.purchase_date else None,
+            'expiry_date': self.expiry_date.isoformat() if self.expiry_date else None,
+            'location': self.location,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'reason': self.reason,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
+
+
+class ArchivedMealPlan(db.Model):
+    """Meal plan whose dates have passed, with its items folded into JSON"""
+    id = db.Column(db.Integer, primary_key=True)
+    original_id = db.Column(db.Integer, nullable=False, index=True)  # id of the original MealPlan
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date, nullable=False)
+    meal_items = db.Column(db.Text, nullable=False, default='[]')  # JSON array of MealPlanItem.to_dict()
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ArchivedMealPlan {self.name}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'original_id': self.original_id,
+            'user_id': self.user_id,
+            'name': self.name,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'meal_items': json.loads(self.meal_items) if self.meal_items else [],
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
+
+
+class ArchivedShoppingList(db.Model):
+    """Completed shopping list, with its items folded into JSON"""
+    id = db.Column(db.Integer, primary_key=True)
+    original_id = db.Column(db.Integer, nullable=False, index=True)  # id of the original ShoppingList
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    items = db.Column(db.Text, nullable=False, default='[]')  # JSON array of ShoppingListItem.to_dict()
+    created_at = db.Column(db.DateTime, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ArchivedShoppingList {self.name}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'original_id': self.original_id,
+            'user_id': self.user_id,
+            'name': self.name,
+            'items': json.loads(self.items) if self.items else [],
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
@@ -0,0 +1,159 @@
+"""Seeded synthetic data generator for the benchmark suite.
+
+Everything is driven from a single ``random.Random(seed)`` so two runs with the
+same parameters produce byte-identical datasets.
+"""
+import io
+import json
+import random
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+CATEGORIES = ['fruits', 'vegetables', 'dairy', 'meat', 'fish', 'bread', 'grains', 'canned', 'frozen', 'other']
+LOCATIONS = ['pantry', 'refrigerator', 'freezer', 'counter', 'cabinet']
+UNITS = ['piece', 'kg', 'g', 'ml', 'l']
+CUISINES = ['asian', 'italian', 'american', 'mediterranean', 'mexican', 'indian', 'french']
+DIFFICULTIES = ['easy', 'medium', 'hard']
+DIETARY_TAGS = ['vegetarian', 'vegan', 'gluten-free', 'high-protein', 'healthy', 'breakfast', 'quick', 'dairy-free']
+
+INGREDIENTS = [
+    'chicken breast', 'beef', 'pork', 'salmon', 'tuna', 'shrimp', 'tofu', 'eggs',
+    'milk', 'cream', 'yogurt', 'butter', 'parmesan', 'cheddar', 'mozzarella',
+    'rice', 'pasta', 'oats', 'flour', 'bread', 'quinoa', 'noodles',
+    'apple', 'banana', 'lemon', 'lime', 'berries', 'orange', 'mango', 'avocado',
+    'tomato', 'onion', 'garlic', 'bell pepper', 'carrot', 'broccoli', 'zucchini',
+    'spinach', 'lettuce', 'cucumber', 'mushrooms', 'potato', 'ginger', 'celery',
+    'basil', 'cinnamon', 'herbs', 'honey', 'soy sauce', 'olive oil', 'oil',
+    'nuts', 'beans', 'lentils', 'chickpeas', 'coconut milk', 'vinegar', 'sugar',
+]
+
+# One shared hash: PBKDF2 per synthetic user would dominate dataset setup time.
+_PASSWORD_HASH = None
+
+
+def _password_hash():
+    global _PASSWORD_HASH
+    if _PASSWORD_HASH is None:
+        _PASSWORD_HASH = generate_password_hash('benchmark-password')
+    return _PASSWORD_HASH
+
+
+def generate_recipes(count, seed=0):
+    """Generate ``count`` recipes in the same shape as ``MOCK_RECIPES``"""
+    rng = random.Random(seed)
+    recipes = []
+
+    for recipe_id in range(1, count + 1):
+        ingredients = rng.sample(INGREDIENTS, rng.randint(4, 10))
+        recipes.append({
+            'id': recipe_id,
+            'name': f'{ingredients[0].title()} {rng.choice(["Bowl", "Stew", "Salad", "Bake", "Stir Fry", "Soup"])} {recipe_id}',
+            'description': f'Synthetic recipe featuring {", ".join(ingredients[:3])}',
+            'ingredients': ingredients,
+            'instructions': [f'Step {step}' for step in range(1, rng.randint(4, 8))],
+            'prep_time': rng.randint(0, 30),
+            'cook_time': rng.randint(0, 60),
+            'servings': rng.randint(1, 6),
+            'difficulty': rng.choice(DIFFICULTIES),
+            'cuisine': rng.choice(CUISINES),
+            'dietary_tags': rng.sample(DIETARY_TAGS, rng.randint(0, 3)),
+            'nutrition': {
+                'calories': rng.randint(150, 900),
+                'protein': rng.randint(2, 50),
+                'carbs': rng.randint(5, 90),
+                'fat': rng.randint(2, 40)
+            }
+        })
+
+    return recipes
+
+
+def seed_database(db, users, items_per_user, recipes, seed=0):
+    """Insert ``users`` users with ``items_per_user`` inventory items each, plus
+    a ``Recipe`` row (with ingredients) for every generated recipe.
+
+    Returns the list of created user ids.
+    """
+    from src.models.user import User
+    from src.models.inventory import InventoryItem
+    from src.models.recipe import Recipe, RecipeIngredient
+    from src.models.preferences import UserPreferences
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = _password_hash()
+
+    db.session.bulk_insert_mappings(User, [
+        {
+            'username': f'bench_user_{n}',
+            'email': f'bench_user_{n}@example.com',
+            'password_hash': password_hash,
+            'first_name': 'Bench',
+            'last_name': str(n)
+        }
+        for n in range(users)
+    ])
+    db.session.flush()
+    user_ids = [user.id for user in User.query.filter(User.username.like('bench_user_%')).order_by(User.id)]
+
+    items = []
+    preferences = []
+    for user_id in user_ids:
+        for _ in range(items_per_user):
+            purchased = now - timedelta(days=rng.randint(0, 30))
+            items.append({
+                'user_id': user_id,
+                'name': rng.choice(INGREDIENTS),
+                'category': rng.choice(CATEGORIES),
+                'quantity': round(rng.uniform(0.1, 5.0), 2),
+                'unit': rng.choice(UNITS),
+                'purchase_date': purchased,
+                'expiry_date': purchased + timedelta(days=rng.randint(1, 60)),
+                'freshness_score': rng.randint(1, 10),
+                'location': rng.choice(LOCATIONS)
+            })
+        preferences.append({
+            'user_id': user_id,
+            'dietary_restrictions': json.dumps(rng.sample(DIETARY_TAGS, rng.randint(0, 1))),
+            'preferred_cuisines': json.dumps(rng.sample(CUISINES, rng.randint(1, 3)))
+        })
+    db.session.bulk_insert_mappings(InventoryItem, items)
+    db.session.bulk_insert_mappings(UserPreferences, preferences)
+
+    for recipe in recipes:
+        row = Recipe(
+            id=recipe['id'],
+            name=recipe['name'],
+            description=recipe['description'],
+            cuisine_type=recipe['cuisine'],
+            difficulty_level=recipe['difficulty'],
+            prep_time=recipe['prep_time'],
+            cook_time=recipe['cook_time'],
+            total_time=recipe['prep_time'] + recipe['cook_time'],
+            servings=recipe['servings'],
+            calories_per_serving=recipe['nutrition']['calories'],
+            instructions=json.dumps(recipe['instructions']),
+            source='generated',
+            tags=json.dumps(recipe['dietary_tags']),
+            nutritional_info=json.dumps(recipe['nutrition'])
+        )
+        row.ingredients = [
+            RecipeIngredient(name=name, quantity=1.0, unit='piece')
+            for name in recipe['ingredients']
+        ]
+        db.session.add(row)
+
+    db.session.commit()
+    return user_ids
+
+
+def generate_image(width=640, height=480, seed=0):
+    """Return JPEG bytes for a deterministic noisy test image"""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    image = Image.frombytes('RGB', (width, height), rng.randbytes(width * height * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
@@ -0,0 +1,451 @@
+"""End-to-end load generator for scripted user sessions.
+
+Each simulated user runs the same flow the app sees in practice: register, log
+in, scan a photo, add the scanned item to the inventory, generate
+suggestions and browse recipes, then read the inventory summary and sync.
+Sessions arrive as a Poisson process at ``--rate`` per second, with at most
+``--concurrency`` running at once. With ``--rate 0`` the workers instead run
+sessions back to back (closed loop). For each endpoint the report shows
+throughput, error rate and latency percentiles.
+
+By default a server is started on a fresh SQLite file with login rate
+limiting off. ``--server`` picks the Werkzeug dev server or gunicorn with
+threaded workers, and ``--database-url`` points it at another database. Use ``--url`` to
+target a server that is already running.
+
+``--find-saturation`` raises the arrival rate step by step. It stops once p99
+latency, the error rate or the share of scheduled sessions that could start
+shows the server can no longer keep up, and reports the last sustainable rate.
+
+Run from the backend directory (the one containing ``src/``):
+
+    python -m benchmarks.loadtest --rate 2 --duration 30
+    python -m benchmarks.loadtest --server gunicorn --server-workers 4 --server-threads 64 --find-saturation
+    python -m benchmarks.loadtest --url http://staging:5001 --rate 5 --json report.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import datagen
+
+SERVER_START_TIMEOUT = 60  # seconds
+REQUEST_TIMEOUT = 60  # seconds
+ERROR_SAMPLES = 3
+
+WSGI_SCRIPT = """
+from werkzeug.serving import run_simple
+from src.main import create_app
+run_simple(%r, %d, create_app(), threaded=True)
+"""
+
+
+class Stats:
+    """Thread-safe latency and error tally per endpoint label"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.samples = {}
+        self.sessions = 0
+        self.failed_sessions = 0
+
+    def record(self, label, seconds, error=None):
+        with self._lock:
+            self.latencies.setdefault(label, []).append(seconds)
+            if error:
+                self.errors[label] = self.errors.get(label, 0) + 1
+                samples = self.samples.setdefault(label, [])
+                if len(samples) < ERROR_SAMPLES:
+                    samples.append(error)
+
+    def session_done(self, ok):
+        with self._lock:
+            self.sessions += 1
+            if not ok:
+                self.failed_sessions += 1
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(stats, elapsed):
+    """Per-endpoint and overall numbers for one run"""
+    endpoints = {}
+    all_latencies = []
+    total_errors = 0
+    for label in sorted(stats.latencies):
+        latencies = sorted(stats.latencies[label])
+        errors = stats.errors.get(label, 0)
+        all_latencies.extend(latencies)
+        total_errors += errors
+        endpoints[label] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'error_rate': round(errors / len(latencies), 4),
+            'throughput_rps': round(len(latencies) / elapsed, 2),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1),
+            'error_samples': stats.samples.get(label, [])
+        }
+
+    all_latencies.sort()
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'sessions': stats.sessions,
+        'failed_sessions': stats.failed_sessions,
+        'session_rate': round(stats.sessions / elapsed, 3),
+        'requests': len(all_latencies),
+        'throughput_rps': round(len(all_latencies) / elapsed, 2),
+        'error_rate': round(total_errors / len(all_latencies), 4) if all_latencies else 0.0,
+        'p50_ms': round(percentile(all_latencies, 0.50) * 1000, 1),
+        'p99_ms': round(percentile(all_latencies, 0.99) * 1000, 1),
+        'endpoints': endpoints
+    }
+
+
+def print_report(report, title):
+    print(f'\n{title}')
+    print(f'{"endpoint":<34} {"reqs":>6} {"err %":>6} {"req/s":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"max ms":>8}')
+    for label, row in report['endpoints'].items():
+        print(f'{label:<34} {row["requests"]:>6} {row["error_rate"] * 100:>6.1f} {row["throughput_rps"]:>7} '
+              f'{row["p50_ms"]:>8} {row["p95_ms"]:>8} {row["p99_ms"]:>8} {row["max_ms"]:>8}')
+    print(f'{"total":<34} {report["requests"]:>6} {report["error_rate"] * 100:>6.1f} {report["throughput_rps"]:>7} '
+          f'{report["p50_ms"]:>8} {"":>8} {report["p99_ms"]:>8}')
+    print(f'sessions: {report["sessions"]} ({report["failed_sessions"]} failed), '
+          f'{report["session_rate"]}/s over {report["elapsed_s"]} s, '
+          f'{report["admitted_ratio"] * 100:.0f}% of {report["scheduled_sessions"]} scheduled admitted')
+    for label, row in report['endpoints'].items():
+        for sample in row['error_samples']:
+            print(f'  error {label}: {sample}')
+
+
+class Client:
+    """Minimal HTTP client keeping one keep-alive connection per thread"""
+
+    def __init__(self, base_url, stats):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+        self.stats = stats
+        self._local = threading.local()
+
+    def _connection(self, fresh=False):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or fresh:
+            if connection is not None:
+                connection.close()
+            connection = self._local.connection = self.connection_class(self.host, self.port, timeout=REQUEST_TIMEOUT)
+        return connection
+
+    def request(self, label, method, path, token=None, json_body=None, body=None, content_type=None, expect=(200,)):
+        """Send one request, record it under ``label`` and return the decoded JSON (None on failure)"""
+        headers = {}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            content_type = 'application/json'
+        if content_type:
+            headers['Content-Type'] = content_type
+
+        start = time.perf_counter()
+        try:
+            for attempt in range(2):
+                try:
+                    connection = self._connection(fresh=attempt > 0)
+                    connection.request(method, path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    payload = response.read()
+                    break
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    # Server closed an idle keep-alive connection; retry once on a new one
+                    if attempt:
+                        raise
+            if response.getheader('Connection', '').lower() == 'close':
+                self._local.connection.close()
+                self._local.connection = None
+        except Exception as e:
+            self.stats.record(label, time.perf_counter() - start, f'{type(e).__name__}: {e}')
+            self._local.connection = None
+            return None
+
+        elapsed = time.perf_counter() - start
+        if response.status not in expect:
+            self.stats.record(label, elapsed, f'HTTP {response.status}: {payload[:120].decode(errors="replace")}')
+            return None
+        self.stats.record(label, elapsed)
+        try:
+            return json.loads(payload) if payload else {}
+        except ValueError:
+            return {}
+
+
+def multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, data, mime) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: {mime}\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def run_session(client, session_id, image, rng):
+    """One scripted user journey; returns False if any step failed"""
+    username = f'load_{session_id}'
+    password = 'load-test-password'
+
+    if client.request('POST /api/register', 'POST', '/api/register', expect=(200, 201), json_body={
+        'username': username, 'email': f'{username}@example.com', 'password': password
+    }) is None:
+        return False
+
+    login = client.request('POST /api/login', 'POST', '/api/login', json_body={'username': username, 'password': password})
+    token = login and login.get('access_token')
+    if not token:
+        return False
+
+    ok = True
+    body, content_type = multipart({'mode': 'single'}, {'image': ('scan.jpg', image, 'image/jpeg')})
+    scan = client.request('POST /api/scan', 'POST', '/api/scan', token=token, body=body, content_type=content_type)
+    ok &= scan is not None
+    scanned = (scan or {}).get('item') or {'name': rng.choice(datagen.INGREDIENTS), 'category': rng.choice(datagen.CATEGORIES)}
+
+    ok &= client.request('POST /api/inventory', 'POST', '/api/inventory', token=token, expect=(200, 201), json_body={
+        'name': scanned['name'], 'category': scanned.get('category', 'other'), 'quantity': 1
+    }) is not None
+    ok &= client.request('POST /api/inventory/bulk', 'POST', '/api/inventory/bulk', token=token, json_body={
+        'create': [{'name': name, 'category': rng.choice(datagen.CATEGORIES)}
+                   for name in rng.sample(datagen.INGREDIENTS, 4)]
+    }) is not None
+
+    ok &= client.request('POST /api/recipes/generate', 'POST', '/api/recipes/generate', token=token, json_body={}) is not None
+    recipes = client.request('GET /api/recipes', 'GET', '/api/recipes', token=token)
+    ok &= recipes is not None
+    ok &= client.request('GET /api/recipes?search=', 'GET', f'/api/recipes?search={rng.choice(datagen.INGREDIENTS).split()[0]}',
+                         token=token) is not None
+    if recipes and recipes.get('recipes'):
+        recipe_id = rng.choice(recipes['recipes'])['id']
+        ok &= client.request('GET /api/recipes/<id>', 'GET', f'/api/recipes/{recipe_id}', token=token) is not None
+        ok &= client.request('GET /api/recipes/<id>/similar', 'GET', f'/api/recipes/{recipe_id}/similar', token=token) is not None
+
+    ok &= client.request('GET /api/inventory/summary', 'GET', '/api/inventory/summary', token=token) is not None
+    ok &= client.request('GET /api/sync', 'GET', '/api/sync?include=inventory_items', token=token) is not None
+    return ok
+
+
+def run_load(base_url, rate, concurrency, duration, image, seed, counter):
+    """Drive sessions for ``duration`` seconds and return the summary"""
+    stats = Stats()
+    client = Client(base_url, stats)
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + duration
+    slots = threading.Semaphore(concurrency)
+
+    def session():
+        try:
+            ok = run_session(client, next(counter), image, random.Random(rng.random()))
+        except Exception:
+            ok = False
+        finally:
+            slots.release()
+        stats.session_done(ok)
+
+    scheduled = started = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        if rate > 0:
+            # Open loop: arrivals follow their own schedule, so queueing shows up as latency.
+            # Arrivals that cannot get a slot before the deadline count as not admitted.
+            next_arrival = start
+            while next_arrival < deadline:
+                scheduled += 1
+                time.sleep(max(0.0, next_arrival - time.perf_counter()))
+                remaining = deadline - time.perf_counter()
+                if remaining > 0 and slots.acquire(timeout=remaining):
+                    pool.submit(session)
+                    started += 1
+                next_arrival += rng.expovariate(rate)
+        else:
+            while time.perf_counter() < deadline:
+                slots.acquire()
+                pool.submit(session)
+                started += 1
+            scheduled = started
+    # Arrivals stop at the deadline but in-flight sessions may finish earlier or later;
+    # never divide by less than the window the load was offered over
+    report = summarize(stats, max(duration, time.perf_counter() - start))
+    report['scheduled_sessions'] = scheduled
+    report['admitted_ratio'] = round(started / scheduled, 3) if scheduled else 1.0
+    return report
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, workers, threads, database_url):
+    """Start the app in a subprocess; return (process, base_url)"""
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, LOGIN_RATE_LIMIT_ENABLED='0', PYTHONUNBUFFERED='1')
+
+    if kind == 'wsgi':
+        command = [sys.executable, '-c', WSGI_SCRIPT % ('127.0.0.1', port)]
+    elif kind == 'gunicorn':
+        if not shutil.which('gunicorn'):
+            raise SystemExit('gunicorn is not installed')
+        command = ['gunicorn', '-k', 'gthread', '-w', str(workers), '--threads', str(threads),
+                   '-b', f'127.0.0.1:{port}', 'src.main:app']
+    else:
+        raise SystemExit(f'Unknown server kind: {kind}')
+
+    # The server logs every request to stderr. A pipe nobody reads would fill up and
+    # block the server mid-run, so stderr goes to an unlinked temp file instead
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, env=env, cwd=os.getcwd(), stdout=subprocess.DEVNULL, stderr=log)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    try:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                log.seek(0)
+                raise SystemExit(f'Server exited during startup:\n{log.read().decode(errors="replace")}')
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+                connection.request('GET', '/metrics')
+                connection.getresponse().read()
+                connection.close()
+                return process, base_url
+            except OSError:
+                time.sleep(0.2)
+        process.kill()
+        raise SystemExit('Server did not start in time')
+    finally:
+        # The server keeps its own descriptor for the file
+        log.close()
+
+
+def saturated(report, previous, args):
+    """Why this step counts as past saturation, or None"""
+    if report['error_rate'] > args.max_error_rate:
+        return f'error rate {report["error_rate"] * 100:.1f}% > {args.max_error_rate * 100:.1f}%'
+    if report['p99_ms'] > args.max_p99_ms:
+        return f'p99 {report["p99_ms"]} ms > {args.max_p99_ms} ms'
+    if report['admitted_ratio'] < 0.9:
+        return f'only {report["admitted_ratio"] * 100:.0f}% of scheduled sessions could start'
+    if previous and report['throughput_rps'] <= previous['throughput_rps']:
+        return 'throughput stopped increasing'
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target an already running server instead of starting one')
+    parser.add_argument('--server', choices=('wsgi', 'gunicorn'), default='wsgi')
+    parser.add_argument('--server-workers', type=int, default=1, help='server processes (gunicorn)')
+    parser.add_argument('--server-threads', type=int, default=32, help='threads per server process (gunicorn)')
+    parser.add_argument('--database-url', help='database for the started server (default: a fresh SQLite file)')
+    parser.add_argument('--rate', type=float, default=2.0, help='new sessions per second (0 = closed loop)')
+    parser.add_argument('--concurrency', type=int, default=16, help='maximum sessions in flight')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds per run or saturation step')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--find-saturation', action='store_true', help='step the rate up until the server saturates')
+    parser.add_argument('--step-factor', type=float, default=1.5, help='rate multiplier between saturation steps')
+    parser.add_argument('--max-steps', type=int, default=10)
+    parser.add_argument('--max-p99-ms', type=float, default=2000.0, help='saturation: p99 latency limit')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help='saturation: error rate limit')
+    parser.add_argument('--json', help='write the full report to this file')
+    args = parser.parse_args(argv)
+
+    image = datagen.generate_image(seed=args.seed)
+    counter = itertools.count(int(time.time() * 1000) % 10 ** 9 * 10000)  # unique usernames across runs
+    process = None
+    tmp = None
+
+    try:
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            database_url = args.database_url
+            if not database_url:
+                tmp = tempfile.TemporaryDirectory()
+                database_url = f"sqlite:///{os.path.join(tmp.name, 'loadtest.db')}"
+            process, base_url = start_server(args.server, args.server_workers, args.server_threads, database_url)
+            print(f'Started {args.server} server at {base_url} ({database_url})')
+
+        if not args.find_saturation:
+            report = run_load(base_url, args.rate, args.concurrency, args.duration, image, args.seed, counter)
+            report['offered_rate'] = args.rate
+            print_report(report, f'rate {args.rate}/s, concurrency {args.concurrency}, {args.duration:.0f} s')
+            result = {'run': report}
+        else:
+            steps = []
+            rate = args.rate if args.rate > 0 else 1.0
+            sustainable = None
+            reason = f'reached --max-steps {args.max_steps}'
+            for _ in range(args.max_steps):
+                report = run_load(base_url, rate, args.concurrency, args.duration, image, args.seed, counter)
+                report['offered_rate'] = round(rate, 3)
+                print_report(report, f'step: {rate:.2f} sessions/s')
+                why = saturated(report, steps[-1] if steps else None, args)
+                steps.append(report)
+                if why:
+                    reason = why
+                    break
+                sustainable = report
+                rate *= args.step_factor
+
+            print(f'\nStopped: {reason}')
+            if sustainable:
+                print(f'Saturation point: about {sustainable["offered_rate"]} sessions/s '
+                      f'({sustainable["throughput_rps"]} req/s, p99 {sustainable["p99_ms"]} ms)')
+            else:
+                print('Saturated at the first step; lower --rate to find the limit.')
+            result = {'steps': steps, 'stop_reason': reason,
+                      'sustainable_rate': sustainable['offered_rate'] if sustainable else None}
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(result, f, indent=2)
+                f.write('\n')
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if tmp is not None:
+            tmp.cleanup()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
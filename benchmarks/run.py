@@ -0,0 +1,262 @@
+"""Micro-benchmarks for the API hot paths.
+
+Runs every case in-process through the Flask test client against an in-memory
+SQLite database filled by ``benchmarks.datagen``, and reports p50/p99 latency,
+bytes allocated per call and SQL statements per call. Results are compared
+against ``benchmarks/baselines.json``. More SQL statements or allocations than
+the baseline make the run exit 1; those numbers do not depend on the machine.
+
+Latency is advisory. It varies from machine to machine, so only latency
+well past the baseline (twice the median, three times the tail) is reported,
+as a warning that does not fail the run.
+
+Run from the backend directory (the one containing ``src/``):
+
+    python -m benchmarks.run
+    python -m benchmarks.run --users 200 --recipes 2000 --items 100
+    python -m benchmarks.run --update-baselines
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+# Allowed slack before a metric is reported. Latency baselines come from
+# whichever machine recorded them, so the latency slack is wide; tail latency
+# is noisier than the median, and jitter of a few milliseconds is never worth a warning.
+P50_TOLERANCE = 1.0
+P99_TOLERANCE = 2.0
+LATENCY_FLOOR_MS = 2.0
+ALLOCATION_TOLERANCE = 0.10
+
+
+class QueryCounter:
+    """Counts SQL statements issued on an engine while active"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        self.active = False
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.count += 1
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(fn, iterations, warmup, counter):
+    """Time ``fn`` and collect allocation and query statistics for it"""
+    for _ in range(warmup):
+        fn()
+
+    # Latency pass, without tracemalloc overhead skewing the numbers
+    timings = []
+    counter.count = 0
+    counter.active = True
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    counter.active = False
+    queries = counter.count / iterations
+
+    # Allocation pass
+    alloc_runs = max(1, iterations // 10)
+    tracemalloc.start()
+    allocated = []
+    for _ in range(alloc_runs):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        allocated.append(peak - before)
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'alloc_kb': round(statistics.median(allocated) / 1024, 1),
+        'queries': round(queries, 2)
+    }
+
+
+def build_cases(app, db, user_ids, image_bytes):
+    """Return an ordered mapping of case name -> zero-arg callable"""
+    import io
+    from flask_jwt_extended import create_access_token
+    from src.models.inventory import InventoryItem
+    from src.models.recipe import Recipe
+    from src.models.user import User
+    from src.models.loading import recipes_with_ingredients
+    from src.routes import recipes as recipes_routes
+
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token(identity=str(user_ids[0]))
+    headers = {'Authorization': f'Bearer {token}'}
+
+    def get(url):
+        def call():
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+        return call
+
+    def generate():
+        response = client.post('/api/recipes/generate', json={}, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def scan():
+        response = client.post(
+            '/api/scan',
+            data={'image': (io.BytesIO(image_bytes), 'scan.jpg'), 'mode': 'single'},
+            headers=headers,
+            content_type='multipart/form-data'
+        )
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def serialize(model, limit, options=(), **to_dict_kwargs):
+        def call():
+            with app.app_context():
+                rows = model.query.options(*options).limit(limit).all()
+                [row.to_dict(**to_dict_kwargs) for row in rows]
+        return call
+
+    with app.app_context():
+        user = db.session.get(User, user_ids[0])
+        pantry = [item.name.lower() for item in user.inventory_items]
+
+    def suggest():
+        recipes_routes.generate_recipe_suggestions(pantry)
+
+    return {
+        'get_recipes': get('/api/recipes'),
+        'get_recipes_filtered': get('/api/recipes?cuisine=italian&difficulty=easy&max_time=45&dietary_tags=vegetarian,healthy'),
+        'get_recipes_search': get('/api/recipes?search=garlic'),
+        'get_similar_recipes': get('/api/recipes/1/similar'),
+        'generate_recipes': generate,
+        'generate_recipe_suggestions': suggest,
+        'scan_image': scan,
+        'to_dict_inventory_item': serialize(InventoryItem, 500),
+        'to_dict_recipe': serialize(Recipe, 500),
+        'to_dict_recipe_with_ingredients': serialize(Recipe, 500, recipes_with_ingredients(), include_ingredients=True),
+        'to_dict_user': serialize(User, 500),
+    }
+
+
+def compare(results, baselines):
+    """Return (regressions, latency warnings) as human-readable descriptions"""
+    regressions = []
+    warnings = []
+
+    for name, current in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            continue
+        for metric, tolerance in (('p50_ms', P50_TOLERANCE), ('p99_ms', P99_TOLERANCE)):
+            expected = baseline[metric]
+            if current[metric] > expected * (1 + tolerance) and current[metric] - expected > LATENCY_FLOOR_MS:
+                warnings.append(f'{name}: {metric} {current[metric]} > baseline {expected}')
+        if current['alloc_kb'] > baseline['alloc_kb'] * (1 + ALLOCATION_TOLERANCE):
+            regressions.append(f'{name}: alloc_kb {current["alloc_kb"]} > baseline {baseline["alloc_kb"]}')
+        # Query counts are deterministic, so any increase is a regression
+        if current['queries'] > baseline['queries']:
+            regressions.append(f'{name}: queries {current["queries"]} > baseline {baseline["queries"]}')
+
+    return regressions, warnings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--recipes', type=int, default=500)
+    parser.add_argument('--items', type=int, default=40, help='inventory items per user')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--only', help='comma-separated case names to run')
+    parser.add_argument('--update-baselines', action='store_true')
+    args = parser.parse_args(argv)
+
+    from src.main import create_app
+    from src.models.user import db
+    from src.routes import recipes as recipes_routes
+    from benchmarks import datagen
+
+    dataset = {'users': args.users, 'recipes': args.recipes, 'items': args.items, 'seed': args.seed}
+    recipes = datagen.generate_recipes(args.recipes, seed=args.seed)
+    original_recipes = list(recipes_routes.MOCK_RECIPES)
+    recipes_routes.MOCK_RECIPES[:] = recipes
+
+    image_dir = tempfile.TemporaryDirectory()
+    # Budget overruns fail the case, like they fail tests
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'IMAGE_STORE_DIR': image_dir.name,
+                      'QUERY_BUDGET_MODE': 'raise'})
+    try:
+        with app.app_context():
+            user_ids = datagen.seed_database(db, args.users, args.items, recipes, seed=args.seed)
+            counter = QueryCounter(db.engine)
+
+        cases = build_cases(app, db, user_ids, datagen.generate_image(seed=args.seed))
+        if args.only:
+            wanted = set(args.only.split(','))
+            cases = {name: fn for name, fn in cases.items() if name in wanted}
+
+        results = {}
+        print(f'{"case":<30} {"p50 ms":>9} {"p99 ms":>9} {"alloc KB":>10} {"queries":>8}')
+        for name, fn in cases.items():
+            results[name] = measure(fn, args.iterations, args.warmup, counter)
+            r = results[name]
+            print(f'{name:<30} {r["p50_ms"]:>9} {r["p99_ms"]:>9} {r["alloc_kb"]:>10} {r["queries"]:>8}')
+    finally:
+        recipes_routes.MOCK_RECIPES[:] = original_recipes
+        image_dir.cleanup()
+
+    stored = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as f:
+            stored = json.load(f)
+
+    if args.update_baselines:
+        cases_baseline = stored.get('cases', {}) if stored.get('dataset') == dataset else {}
+        cases_baseline.update(results)
+        with open(BASELINES_PATH, 'w') as f:
+            json.dump({'dataset': dataset, 'cases': cases_baseline},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\nBaselines written to {BASELINES_PATH}')
+        return 0
+
+    if stored.get('dataset') != dataset:
+        print('\nNo baselines for this dataset size; run with --update-baselines to record them.')
+        return 0
+
+    regressions, warnings = compare(results, stored.get('cases', {}))
+    if warnings:
+        print('\nSlower than baseline (advisory):')
+        for line in warnings:
+            print(f'  {line}')
+    if regressions:
+        print('\nRegressions:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+
+    print('\nNo regressions against stored baselines.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Startup-time budget check.
+
+Each measurement runs in a fresh interpreter so nothing is already imported:
+
+* ``import src.main`` must stay under ``IMPORT_BUDGET_MS`` and must not
+  import Flask, SQLAlchemy or PIL; those belong to ``create_app()``.
+* ``create_app()`` against an existing, up-to-date database (the worker
+  restart case) must stay under ``COLD_START_BUDGET_MS`` and must leave PIL
+  to be imported on the first scan.
+
+Run from the backend directory (the one containing ``src/``):
+
+    python -m benchmarks.startup
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_BUDGET_MS = 50
+COLD_START_BUDGET_MS = 1500
+IMPORT_LAZY_MODULES = ('flask', 'flask_sqlalchemy', 'PIL')
+APP_LAZY_MODULES = ('PIL',)
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src.main
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+""" % (IMPORT_LAZY_MODULES,)
+
+CREATE_APP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.main import create_app
+app = create_app({'SQLALCHEMY_DATABASE_URI': %r})
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def run_child(script):
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        check=True, capture_output=True, text=True, cwd=os.getcwd()
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    imports = [run_child(IMPORT_SCRIPT) for _ in range(args.runs)]
+    import_ms = statistics.median(run['ms'] for run in imports)
+    print(f'import src.main        {import_ms:8.1f} ms  (budget {IMPORT_BUDGET_MS} ms)')
+    if import_ms > IMPORT_BUDGET_MS:
+        failures.append(f'import src.main took {import_ms:.1f} ms')
+    for module in imports[0]['loaded']:
+        failures.append(f'import src.main loaded {module} eagerly')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        script = CREATE_APP_SCRIPT % (uri, APP_LAZY_MODULES)
+
+        first = run_child(script)
+        print(f'create_app (new db)    {first["ms"]:8.1f} ms')
+
+        restarts = [run_child(script) for _ in range(args.runs)]
+        restart_ms = statistics.median(run['ms'] for run in restarts)
+        print(f'create_app (restart)   {restart_ms:8.1f} ms  (budget {COLD_START_BUDGET_MS} ms)')
+        if restart_ms > COLD_START_BUDGET_MS:
+            failures.append(f'create_app on an existing database took {restart_ms:.1f} ms')
+        for module in restarts[0]['loaded']:
+            failures.append(f'create_app loaded {module} eagerly')
+
+    if failures:
+        print('\nStartup budget exceeded:')
+        for line in failures:
+            print(f'  {line}')
+        return 1
+
+    print('\nWithin startup budget.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
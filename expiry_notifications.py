@@ -0,0 +1,219 @@
+"""Sweep all users for items about to expire and hand alerts to a notification sink.
+
+Users are taken in keyset-paged batches. Each batch is one query that joins
+the batch's users with their inventory items inside the alert window, their
+notification settings, and the alerts already sent for those items. Memory
+stays flat however many users there are. An alert is recorded as sent only
+after the sink accepts it, so a failed batch is retried on the next sweep.
+
+Users control alerts via ``UserPreferences.notification_preferences``:
+
+    {"expiry_alerts": true, "expiry_days_before": 3}
+
+Run one sweep at a time, from cron:
+
+    flask --app src.main send-expiry-notifications --batch-size 1000
+"""
+import importlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import and_, insert, select
+
+from src.models.user import db, User
+from src.models.inventory import InventoryItem
+from src.models.preferences import UserPreferences
+from src.models.notification import ExpiryNotification
+
+DEFAULT_DAYS_BEFORE = 3
+MAX_DAYS_BEFORE = 14
+EXPIRED_GRACE_DAYS = 1  # items that expired within this many days are still alerted once
+NOTIFICATION_RETENTION_DAYS = 90
+
+
+class NotificationSink:
+    """Where alert messages go; ``send`` must raise if delivery failed"""
+
+    def send(self, messages):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileSink(NotificationSink):
+    """Appends one JSON line per message; a local stand-in for a push or email service"""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def send(self, messages):
+        for message in messages:
+            self.file.write(json.dumps(message) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+def get_sink(spec):
+    """Build a sink from ``file:<path>`` or ``package.module:factory``"""
+    if spec.startswith('file:'):
+        return FileSink(spec[len('file:'):])
+    module_name, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f'Unknown notification sink: {spec}')
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def default_sink_spec():
+    return current_app.config.get('EXPIRY_NOTIFICATION_SINK') or os.environ.get(
+        'EXPIRY_NOTIFICATION_SINK',
+        f"file:{os.path.join(current_app.root_path, 'database', 'expiry_notifications.jsonl')}"
+    )
+
+
+def alert_settings(raw):
+    """Return (enabled, days_before) from a notification_preferences JSON string"""
+    try:
+        settings = json.loads(raw) if raw else {}
+    except (TypeError, ValueError):
+        settings = {}
+    if not isinstance(settings, dict):
+        settings = {}
+    try:
+        days_before = int(settings.get('expiry_days_before', DEFAULT_DAYS_BEFORE))
+    except (TypeError, ValueError):
+        days_before = DEFAULT_DAYS_BEFORE
+    return settings.get('expiry_alerts', True) is not False, max(0, min(days_before, MAX_DAYS_BEFORE))
+
+
+def batch_query(last_id, batch_size, now):
+    """One batch of users joined with their unalerted items inside the widest alert window"""
+    users = select(User.id, User.username, User.email).where(
+        User.id > last_id, User.is_active.is_(True)
+    ).order_by(User.id).limit(batch_size).subquery()
+
+    return select(
+        users.c.id, users.c.username, users.c.email,
+        UserPreferences.notification_preferences,
+        InventoryItem.id, InventoryItem.name, InventoryItem.expiry_date
+    ).select_from(users).outerjoin(
+        UserPreferences, UserPreferences.user_id == users.c.id
+    ).outerjoin(
+        # Dedupe inside the join condition so every user in the batch still yields a row
+        InventoryItem, and_(
+            InventoryItem.user_id == users.c.id,
+            InventoryItem.expiry_date >= now - timedelta(days=EXPIRED_GRACE_DAYS),
+            InventoryItem.expiry_date <= now + timedelta(days=MAX_DAYS_BEFORE),
+            ~select(ExpiryNotification.id).where(
+                ExpiryNotification.inventory_item_id == InventoryItem.id,
+                ExpiryNotification.expiry_date == InventoryItem.expiry_date
+            ).exists()
+        )
+    ).order_by(users.c.id, InventoryItem.expiry_date)
+
+
+def build_messages(rows, now):
+    """Group a batch's rows into one message per user, honouring each user's settings"""
+    messages = {}
+    for user_id, username, email, raw_settings, item_id, name, expiry_date in rows:
+        if item_id is None:
+            continue
+        enabled, days_before = alert_settings(raw_settings)
+        if not enabled or expiry_date > now + timedelta(days=days_before):
+            continue
+
+        message = messages.get(user_id)
+        if message is None:
+            message = messages[user_id] = {
+                'type': 'expiry_alert',
+                'user_id': user_id,
+                'username': username,
+                'email': email,
+                'items': []
+            }
+        message['items'].append({
+            'inventory_item_id': item_id,
+            'name': name,
+            'expiry_date': expiry_date.isoformat(),
+            'expired': expiry_date < now
+        })
+    return list(messages.values())
+
+
+def send_expiry_notifications(sink, batch_size=1000, pause=0.0):
+    """Sweep every user once; return (users scanned, messages sent, items alerted)"""
+    now = datetime.utcnow()
+    last_id = 0
+    users_scanned = messages_sent = items_alerted = 0
+
+    while True:
+        rows = db.session.execute(batch_query(last_id, batch_size, now)).all()
+        if not rows:
+            break
+
+        batch_user_ids = {row[0] for row in rows}
+        messages = build_messages(rows, now)
+        if messages:
+            sink.send(messages)
+            sent_at = datetime.utcnow()
+            db.session.execute(insert(ExpiryNotification), [
+                {'user_id': message['user_id'], 'inventory_item_id': item['inventory_item_id'],
+                 'expiry_date': datetime.fromisoformat(item['expiry_date']), 'sent_at': sent_at}
+                for message in messages for item in message['items']
+            ])
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+        users_scanned += len(batch_user_ids)
+        messages_sent += len(messages)
+        items_alerted += sum(len(message['items']) for message in messages)
+        last_id = max(batch_user_ids)
+
+        if pause:
+            time.sleep(pause)
+
+    return users_scanned, messages_sent, items_alerted
+
+
+def purge_sent_notifications(batch_size=1000):
+    """Drop dedupe records old enough that their items have long expired"""
+    cutoff = datetime.utcnow() - timedelta(days=NOTIFICATION_RETENTION_DAYS)
+    purged = 0
+    while True:
+        ids = [row.id for row in db.session.query(ExpiryNotification.id).filter(
+            ExpiryNotification.sent_at < cutoff
+        ).limit(batch_size)]
+        if not ids:
+            return purged
+        ExpiryNotification.query.filter(ExpiryNotification.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        purged += len(ids)
+
+
+@click.command('send-expiry-notifications')
+@click.option('--batch-size', default=1000, show_default=True, help='Users per query.')
+@click.option('--pause', default=0.0, show_default=True, help='Seconds to sleep between batches.')
+@click.option('--sink', 'sink_spec', default=None,
+              help='file:<path> or package.module:factory (default: EXPIRY_NOTIFICATION_SINK).')
+@with_appcontext
+def send_expiry_notifications_command(batch_size, pause, sink_spec):
+    """Send alerts for inventory items that are about to expire."""
+    sink = get_sink(sink_spec or default_sink_spec())
+    try:
+        users, messages, items = send_expiry_notifications(sink, batch_size, pause)
+    finally:
+        sink.close()
+    purged = purge_sent_notifications()
+    current_app.logger.info('Expiry sweep: %d users, %d messages, %d items, %d old records purged',
+                            users, messages, items, purged)
+    click.echo(f'Scanned {users} users, sent {messages} messages covering {items} items.')
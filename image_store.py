@@ -0,0 +1,180 @@
+"""Content-addressed on-disk store for uploaded and scanned food photos.
+
+Images are keyed by the SHA-256 of the uploaded bytes, so storing the same
+photo twice costs nothing. On first ingest the original is kept as uploaded.
+A ``thumb`` and a ``medium`` JPEG rendition are generated once with PIL, so
+requests never resize. Files live under ``<root>/<ab>/<digest>/``:
+
+    original.<ext> as uploaded (any format PIL can read)
+    medium.jpg     fits in 800x800
+    thumb.jpg      fits in 200x200, used by the inventory and recipe grids
+
+Because content never changes for a digest, ``/api/images/<digest>/<rendition>``
+is served with a one-year ``immutable`` cache lifetime and a strong ETag.
+
+Every scan is stored, but most scanned photos never end up on an inventory item
+or recipe. The directory's mtime records when an entry was last ingested.
+``sweep()``, run by the ``archive-data`` job, deletes entries that no row
+references once they are older than a grace period.
+"""
+import hashlib
+import io
+import os
+import re
+import shutil
+import tempfile
+import time
+
+from flask import current_app
+
+RENDITIONS = {
+    'thumb': (200, 200),
+    'medium': (800, 800),
+}
+RENDITION_QUALITY = 82
+MAX_IMAGE_PIXELS = 40_000_000  # refuse decompression bombs before resizing
+ORIGINAL_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif', 'BMP': 'bmp', 'MPO': 'jpg'}
+IMAGE_URL_PREFIX = '/api/images/'
+DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+STORE_URL_RE = re.compile(r'^/api/images/([0-9a-f]{64})/(?:original|medium|thumb)$')
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def image_url(digest, rendition='medium'):
+    return f'{IMAGE_URL_PREFIX}{digest}/{rendition}'
+
+
+def url_digest(url):
+    """Digest of a stored image URL, or None for other URLs"""
+    match = STORE_URL_RE.match(url) if url else None
+    return match.group(1) if match else None
+
+
+def thumbnail_url(url):
+    """Thumbnail URL for a stored image URL; other URLs are returned unchanged"""
+    match = STORE_URL_RE.match(url) if url else None
+    return image_url(match.group(1), 'thumb') if match else url
+
+
+class ImageStore:
+    def __init__(self, root):
+        self.root = root
+
+    def directory(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def path(self, digest, rendition):
+        """Filesystem path of a rendition, or None if it is not stored"""
+        if not DIGEST_RE.match(digest):
+            return None
+        directory = self.directory(digest)
+        if rendition == 'original':
+            for name in os.listdir(directory) if os.path.isdir(directory) else ():
+                if name.startswith('original.'):
+                    return os.path.join(directory, name)
+            return None
+        if rendition not in RENDITIONS:
+            return None
+        path = os.path.join(directory, f'{rendition}.jpg')
+        return path if os.path.isfile(path) else None
+
+    def ingest(self, data, image=None):
+        """Store ``data`` and its renditions; return {'digest', 'urls'}.
+
+        ``image`` may be an already decoded PIL image of ``data`` to skip a
+        second decode. Raises ``InvalidImage`` if the bytes are not an image.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        directory = self.directory(digest)
+
+        # The thumbnail is written last, so its presence means the entry is complete
+        if not os.path.isfile(os.path.join(directory, 'thumb.jpg')):
+            self._write_entry(directory, data, image)
+        else:
+            # Re-ingesting counts as a fresh use, so the sweep's grace period starts over
+            os.utime(directory)
+
+        return {
+            'digest': digest,
+            'urls': {rendition: image_url(digest, rendition) for rendition in ('original', 'medium', 'thumb')}
+        }
+
+    def _write_entry(self, directory, data, image):
+        from PIL import Image, ImageOps
+
+        Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+        try:
+            source = Image.open(io.BytesIO(data))
+            extension = ORIGINAL_EXTENSIONS.get(source.format, 'bin')
+            if image is None:
+                image = source
+            # Phone cameras store rotation in EXIF; bake it in so renditions display upright
+            image = ImageOps.exif_transpose(image)
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise InvalidImage('Unsupported or corrupt image file') from e
+
+        os.makedirs(directory, exist_ok=True)
+        self._write_atomic(os.path.join(directory, f'original.{extension}'), data)
+        # Largest first so each step resizes an already smaller image
+        for rendition, size in sorted(RENDITIONS.items(), key=lambda entry: -entry[1][0]):
+            image = image.copy()
+            image.thumbnail(size, Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=RENDITION_QUALITY, optimize=True, progressive=True)
+            self._write_atomic(os.path.join(directory, f'{rendition}.jpg'), buffer.getvalue())
+
+    def digests(self):
+        """Yield (digest, directory) for every stored entry"""
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for digest in os.listdir(prefix_dir):
+                if DIGEST_RE.match(digest):
+                    yield digest, os.path.join(prefix_dir, digest)
+
+    def sweep(self, referenced, grace_seconds):
+        """Delete entries not in ``referenced`` and unused for ``grace_seconds``; return how many"""
+        removed = 0
+        for digest, directory in self.digests():
+            if digest in referenced:
+                continue
+            try:
+                # Checked right before deleting, so an entry re-ingested during the sweep is kept
+                if time.time() - os.stat(directory).st_mtime < grace_seconds:
+                    continue
+                shutil.rmtree(directory)
+            except OSError:
+                continue
+            removed += 1
+        return removed
+
+    @staticmethod
+    def _write_atomic(path, data):
+        # Concurrent ingests of the same photo each write a temp file; the rename makes the last one win
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def init_image_store(app):
+    root = app.config.get('IMAGE_STORE_DIR') or os.environ.get(
+        'IMAGE_STORE_DIR', os.path.join(app.root_path, 'database', 'images')
+    )
+    app.extensions['image_store'] = ImageStore(root)
+
+
+def get_image_store():
+    return current_app.extensions['image_store']
@@ -0,0 +1,52 @@
+from flask import Blueprint, jsonify, request, send_file
+from flask_jwt_extended import jwt_required
+from src.image_store import get_image_store, InvalidImage, DIGEST_RE
+from src.static_assets import IMMUTABLE_CACHE
+from src.metrics import query_budget
+
+images_bp = Blueprint('images', __name__)
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+RENDITION_MIMETYPES = {'medium': 'image/jpeg', 'thumb': 'image/jpeg'}
+
+@images_bp.route('/images', methods=['POST'])
+@query_budget(1)
+@jwt_required()
+def upload_image():
+    """Store a photo for an inventory item or recipe; returns its rendition URLs"""
+    try:
+        if 'image' not in request.files:
+            return jsonify({'error': 'No image file provided'}), 400
+
+        data = request.files['image'].read(MAX_UPLOAD_BYTES + 1)
+        if not data:
+            return jsonify({'error': 'No image file selected'}), 400
+        if len(data) > MAX_UPLOAD_BYTES:
+            return jsonify({'error': 'Image is too large'}), 413
+
+        try:
+            stored = get_image_store().ingest(data)
+        except InvalidImage as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({'image': stored}), 201
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@images_bp.route('/images/<digest>/<rendition>', methods=['GET'])
+@query_budget(0)
+def get_image(digest, rendition):
+    """Serve a stored rendition; public so <img> tags can load it without a token.
+
+    Digests are unguessable and content never changes, so responses are
+    cacheable forever. ``send_file`` answers If-None-Match and Range requests.
+    """
+    path = get_image_store().path(digest, rendition) if DIGEST_RE.match(digest) else None
+    if path is None:
+        return jsonify({'error': 'Image not found'}), 404
+
+    response = send_file(path, mimetype=RENDITION_MIMETYPES.get(rendition), etag=f'{digest}-{rendition}',
+                         conditional=True, max_age=31536000)
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE
+    return response
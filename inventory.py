@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from src.models.user import db
+from src.image_store import thumbnail_url
 
 class InventoryItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -19,6 +20,12 @@ class InventoryItem(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Delta sync reads a user's rows changed since a cursor; expiry alerts read a user's expiry window
+    __table_args__ = (
+        db.Index('ix_inventory_item_user_updated', 'user_id', 'updated_at'),
+        db.Index('ix_inventory_item_user_expiry', 'user_id', 'expiry_date'),
+    )
+
     # Relationship
     user = db.relationship('User', backref=db.backref('inventory_items', lazy=True))
 
@@ -39,6 +46,7 @@ class InventoryItem(db.Model):
             'location': self.location,
             'barcode': self.barcode,
             'image_url': self.image_url,
+            'thumbnail_url': thumbnail_url(self.image_url),
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
@@ -0,0 +1,232 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+from src.models.user import db
+from src.models.inventory import InventoryItem
+from src.models.inventory_summary import SummaryDelta, apply_summary_delta
+from src.models.tombstone import add_tombstones
+from src.models.recommendation import mark_recommendations_stale
+from src.routes.scanner import estimate_expiry_date
+from src.metrics import query_budget
+
+inventory_bulk_bp = Blueprint('inventory_bulk', __name__)
+
+MAX_BATCH_SIZE = 200
+DEFAULT_FRESHNESS_SCORE = 10  # assume freshly bought when the scan gave no score
+BULK_FIXED_QUERIES = 9
+
+# Writable fields and their parsers
+STRING_FIELDS = {'name': 100, 'category': 50, 'unit': 20, 'location': 50, 'barcode': 50, 'image_url': 200}
+DATE_FIELDS = ('purchase_date', 'expiry_date')
+
+def parse_item_fields(data, require_name):
+    """Validate one item payload; return (mapping, errors)"""
+    mapping = {}
+    errors = []
+
+    if not isinstance(data, dict):
+        return mapping, ['Item must be an object']
+
+    for field, max_length in STRING_FIELDS.items():
+        if field in data and data[field] is not None:
+            value = str(data[field]).strip()
+            if len(value) > max_length:
+                errors.append(f'{field} must be at most {max_length} characters')
+            mapping[field] = value
+
+    if require_name and not mapping.get('name'):
+        errors.append('name is required')
+    if 'name' in data and not mapping.get('name') and not require_name:
+        errors.append('name cannot be empty')
+
+    if 'quantity' in data:
+        try:
+            mapping['quantity'] = float(data['quantity'])
+            if mapping['quantity'] < 0:
+                errors.append('quantity cannot be negative')
+        except (TypeError, ValueError):
+            errors.append('quantity must be a number')
+
+    if data.get('freshness_score') is not None:
+        try:
+            mapping['freshness_score'] = int(data['freshness_score'])
+            if not 1 <= mapping['freshness_score'] <= 10:
+                errors.append('freshness_score must be between 1 and 10')
+        except (TypeError, ValueError):
+            errors.append('freshness_score must be an integer')
+
+    for field in DATE_FIELDS:
+        if data.get(field):
+            try:
+                mapping[field] = datetime.fromisoformat(str(data[field]).replace('Z', '+00:00')).replace(tzinfo=None)
+            except ValueError:
+                errors.append(f'{field} must be an ISO date')
+
+    if 'notes' in data:
+        mapping['notes'] = data['notes']
+
+    return mapping, errors
+
+def is_item_id(value):
+    """JSON integers only; bool is an int subclass, so ``true`` would otherwise mean id 1"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def bulk_query_budget():
+    """Fixed statements, plus one INSERT per created row: SQLite cannot return ordered ids from a multi-row INSERT"""
+    data = request.get_json(silent=True)
+    creates = data.get('create') if isinstance(data, dict) else None
+    return BULK_FIXED_QUERIES + (len(creates) if isinstance(creates, list) else 0)
+
+@inventory_bulk_bp.route('/inventory/bulk', methods=['POST'])
+@query_budget(bulk_query_budget)
+@jwt_required()
+def bulk_inventory():
+    """Create, update and delete many inventory items in one transaction.
+
+    Body: {"create": [item, ...], "update": [{"id": 1, ...}, ...], "delete": [id, ...]}
+    The whole batch is validated first; if any entry is invalid nothing is written.
+    """
+    try:
+        current_user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True) or {}
+
+        creates = data.get('create') or []
+        updates = data.get('update') or []
+        deletes = data.get('delete') or []
+
+        if not all(isinstance(entries, list) for entries in (creates, updates, deletes)):
+            return jsonify({'error': 'create, update and delete must be lists'}), 400
+
+        if len(creates) + len(updates) + len(deletes) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch is limited to {MAX_BATCH_SIZE} operations'}), 400
+
+        # Ownership of every referenced id, checked with a single query
+        referenced_ids = set()
+        for entry in updates:
+            if isinstance(entry, dict) and is_item_id(entry.get('id')):
+                referenced_ids.add(entry['id'])
+        referenced_ids.update(item_id for item_id in deletes if is_item_id(item_id))
+        owned = {}
+        if referenced_ids:
+            owned = {row.id: row for row in db.session.query(
+                InventoryItem.id, InventoryItem.category, InventoryItem.location, InventoryItem.expiry_date
+            ).filter(
+                InventoryItem.user_id == current_user_id,
+                InventoryItem.id.in_(referenced_ids)
+            )}
+        owned_ids = set(owned)
+
+        results = {'create': [], 'update': [], 'delete': []}
+        create_mappings = []
+        update_mappings = []
+        delete_ids = []
+        has_errors = False
+
+        # Validate the whole batch, filling in estimated expiry dates as we go
+        for index, entry in enumerate(creates):
+            mapping, errors = parse_item_fields(entry, require_name=True)
+            if errors:
+                has_errors = True
+                results['create'].append({'index': index, 'status': 'invalid', 'errors': errors})
+                continue
+
+            mapping['user_id'] = current_user_id
+            mapping.setdefault('category', 'other')
+            if 'expiry_date' not in mapping:
+                mapping['expiry_date'] = datetime.fromisoformat(estimate_expiry_date(
+                    mapping['name'], mapping['category'],
+                    mapping.get('freshness_score', DEFAULT_FRESHNESS_SCORE)
+                ))
+            create_mappings.append(mapping)
+            results['create'].append({'index': index, 'status': 'created'})
+
+        seen_ids = set()
+        for index, entry in enumerate(updates):
+            mapping, errors = parse_item_fields(entry, require_name=False)
+            item_id = entry.get('id') if isinstance(entry, dict) else None
+            if not is_item_id(item_id):
+                errors.append('id is required')
+            elif item_id not in owned_ids:
+                errors.append('Item not found')
+            elif item_id in seen_ids:
+                errors.append('Item appears more than once in the batch')
+            seen_ids.add(item_id)
+
+            if errors:
+                has_errors = True
+                results['update'].append({'index': index, 'id': item_id, 'status': 'invalid', 'errors': errors})
+                continue
+
+            mapping['id'] = item_id
+            mapping['updated_at'] = datetime.utcnow()
+            update_mappings.append(mapping)
+            results['update'].append({'index': index, 'id': item_id, 'status': 'updated'})
+
+        for index, item_id in enumerate(deletes):
+            if not is_item_id(item_id) or item_id not in owned_ids:
+                has_errors = True
+                results['delete'].append({'index': index, 'id': item_id, 'status': 'invalid', 'errors': ['Item not found']})
+            elif item_id in seen_ids:
+                has_errors = True
+                results['delete'].append({'index': index, 'id': item_id, 'status': 'invalid',
+                                          'errors': ['Item appears more than once in the batch']})
+            else:
+                seen_ids.add(item_id)
+                delete_ids.append(item_id)
+                results['delete'].append({'index': index, 'id': item_id, 'status': 'deleted'})
+
+        if has_errors:
+            return jsonify({'error': 'Validation failed, nothing was saved', 'results': results}), 400
+
+        # Bulk statements skip flush events, so the summary delta (and tombstones below) are applied explicitly
+        delta = SummaryDelta()
+        for mapping in create_mappings:
+            delta.add(current_user_id, mapping.get('category'), mapping.get('location'), mapping.get('expiry_date'))
+        for mapping in update_mappings:
+            old = owned[mapping['id']]
+            delta.add(current_user_id, old.category, old.location, old.expiry_date, sign=-1)
+            delta.add(current_user_id, mapping.get('category', old.category), mapping.get('location', old.location),
+                      mapping.get('expiry_date', old.expiry_date))
+        for item_id in delete_ids:
+            old = owned[item_id]
+            delta.add(current_user_id, old.category, old.location, old.expiry_date, sign=-1)
+
+        # One transaction for the whole batch
+        try:
+            if create_mappings:
+                db.session.bulk_insert_mappings(InventoryItem, create_mappings, return_defaults=True)
+            if update_mappings:
+                db.session.bulk_update_mappings(InventoryItem, update_mappings)
+            if delete_ids:
+                InventoryItem.query.filter(
+                    InventoryItem.user_id == current_user_id,
+                    InventoryItem.id.in_(delete_ids)
+                ).delete(synchronize_session=False)
+                add_tombstones(db.session, InventoryItem, current_user_id, delete_ids)
+            if delta:
+                apply_summary_delta(db.session.connection(), delta)
+                mark_recommendations_stale(db.session.connection(), [current_user_id])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        # Return the saved rows so the client can update its list without a refetch
+        for result, mapping in zip(results['create'], create_mappings):
+            result['id'] = mapping['id']
+        saved_ids = [mapping['id'] for mapping in create_mappings] + [mapping['id'] for mapping in update_mappings]
+        saved = {}
+        if saved_ids:
+            saved = {item.id: item.to_dict() for item in InventoryItem.query.filter(InventoryItem.id.in_(saved_ids))}
+        for result in results['create'] + results['update']:
+            result['item'] = saved.get(result['id'])
+
+        return jsonify({
+            'results': results,
+            'created': len(create_mappings),
+            'updated': len(update_mappings),
+            'deleted': len(delete_ids)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
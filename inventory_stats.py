@@ -0,0 +1,77 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from src.models.user import db
+from src.models.archive import ArchivedInventoryItem
+from src.models.inventory_summary import InventorySummary
+from src.jobs.summary_reconciler import reconcile_users
+from src.metrics import query_budget
+
+inventory_stats_bp = Blueprint('inventory_stats', __name__)
+
+EMPTY_SUMMARY = {
+    'total_items': 0,
+    'categories': {},
+    'locations': {},
+    'expired': 0,
+    'expiring_soon': 0,
+    'updated_at': None,
+    'reconciled_at': None
+}
+
+@inventory_stats_bp.route('/inventory/summary', methods=['GET'])
+@query_budget(5)  # 2, or 5 when the summary row is rebuilt inline
+@jwt_required()
+def get_inventory_summary():
+    """Inventory stats for the current user, read from the maintained summary row"""
+    try:
+        current_user_id = int(get_jwt_identity())
+
+        summary = db.session.get(InventorySummary, current_user_id)
+        if summary is None:
+            # No row yet (e.g. items created before summaries existed): build it once from the items
+            reconcile_users([current_user_id])
+            db.session.commit()
+            summary = db.session.get(InventorySummary, current_user_id)
+
+        if summary is None:
+            return jsonify(dict(EMPTY_SUMMARY, user_id=current_user_id)), 200
+
+        return jsonify(summary.to_dict()), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@inventory_stats_bp.route('/inventory/waste', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def get_waste_report():
+    """Archived items by reason and category over the last ?days= days (default 90)"""
+    try:
+        current_user_id = int(get_jwt_identity())
+        days = request.args.get('days', 90, type=int)
+        since = datetime.utcnow() - timedelta(days=days)
+
+        rows = db.session.query(
+            ArchivedInventoryItem.reason, ArchivedInventoryItem.category, func.count()
+        ).filter(
+            ArchivedInventoryItem.user_id == current_user_id,
+            ArchivedInventoryItem.archived_at >= since
+        ).group_by(ArchivedInventoryItem.reason, ArchivedInventoryItem.category)
+
+        report = {'expired': {}, 'consumed': {}}
+        for reason, category, count in rows:
+            report.setdefault(reason, {})[category] = count
+
+        return jsonify({
+            'days': days,
+            'expired': report['expired'],
+            'consumed': report['consumed'],
+            'total_expired': sum(report['expired'].values()),
+            'total_consumed': sum(report['consumed'].values())
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,188 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime, timedelta
+from collections import Counter
+import json
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.inventory import InventoryItem
+
+EXPIRING_SOON_DAYS = 3
+TRACKED_FIELDS = ('user_id', 'category', 'location', 'expiry_date')
+
+class InventorySummary(db.Model):
+    """Per-user inventory aggregates, kept in step with InventoryItem writes by flush events.
+
+    Expired/expiring counts depend on the current date, so expiry dates are
+    stored as a per-day histogram and the counts are derived at read time.
+    """
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total_items = db.Column(db.Integer, nullable=False, default=0)
+    categories = db.Column(db.Text, nullable=False, default='{}')  # JSON object: category -> count
+    locations = db.Column(db.Text, nullable=False, default='{}')  # JSON object: location -> count
+    expiry_days = db.Column(db.Text, nullable=False, default='{}')  # JSON object: YYYY-MM-DD -> count
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    reconciled_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<InventorySummary user_id={self.user_id} total={self.total_items}>'
+
+    def to_dict(self, today=None):
+        today = today or datetime.utcnow().date()
+        soon = (today + timedelta(days=EXPIRING_SOON_DAYS)).isoformat()
+        today = today.isoformat()
+        expiry_days = json.loads(self.expiry_days or '{}')
+
+        return {
+            'user_id': self.user_id,
+            'total_items': self.total_items,
+            'categories': json.loads(self.categories or '{}'),
+            'locations': json.loads(self.locations or '{}'),
+            'expired': sum(count for day, count in expiry_days.items() if day < today),
+            'expiring_soon': sum(count for day, count in expiry_days.items() if today <= day <= soon),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'reconciled_at': self.reconciled_at.isoformat() if self.reconciled_at else None
+        }
+
+
+class SummaryDelta:
+    """Accumulates +/- item changes per user before they are written"""
+
+    def __init__(self):
+        self.users = {}
+
+    def add(self, user_id, category, location, expiry_date, sign=1):
+        if user_id is None:
+            return
+        delta = self.users.get(user_id)
+        if delta is None:
+            delta = self.users[user_id] = {'total': 0, 'categories': Counter(), 'locations': Counter(), 'expiry_days': Counter()}
+        delta['total'] += sign
+        if category:
+            delta['categories'][category] += sign
+        if location:
+            delta['locations'][location] += sign
+        if expiry_date:
+            delta['expiry_days'][expiry_date.date().isoformat()] += sign
+
+    def __bool__(self):
+        return bool(self.users)
+
+
+def _merge_counts(stored, delta):
+    counts = Counter(json.loads(stored or '{}'))
+    counts.update(delta)
+    return json.dumps({key: count for key, count in sorted(counts.items()) if count > 0})
+
+
+def compute_summaries(connection, user_ids):
+    """Return {user_id: {'total_items', 'categories', 'locations', 'expiry_days'}} counted from InventoryItem rows"""
+    items = InventoryItem.__table__
+    expiry_day = func.date(items.c.expiry_date)
+    rows = connection.execute(
+        select(items.c.user_id, items.c.category, items.c.location, expiry_day, func.count())
+        .where(items.c.user_id.in_(user_ids))
+        .group_by(items.c.user_id, items.c.category, items.c.location, expiry_day)
+    )
+
+    summaries = {user_id: {'total_items': 0, 'categories': Counter(), 'locations': Counter(), 'expiry_days': Counter()}
+                 for user_id in user_ids}
+    for user_id, category, location, day, count in rows:
+        summary = summaries[user_id]
+        summary['total_items'] += count
+        if category:
+            summary['categories'][category] += count
+        if location:
+            summary['locations'][location] += count
+        if day:
+            summary['expiry_days'][str(day)[:10]] += count
+
+    return {
+        user_id: {
+            'total_items': summary['total_items'],
+            'categories': json.dumps(dict(sorted(summary['categories'].items()))),
+            'locations': json.dumps(dict(sorted(summary['locations'].items()))),
+            'expiry_days': json.dumps(dict(sorted(summary['expiry_days'].items())))
+        }
+        for user_id, summary in summaries.items()
+    }
+
+
+def apply_summary_delta(connection, delta):
+    """Write accumulated deltas to the summary rows on ``connection`` (the flush's transaction).
+
+    Callers apply the delta after the item rows are written, so a user without a
+    summary row yet gets one counted from their items rather than from the delta.
+    """
+    table = InventorySummary.__table__
+    now = datetime.utcnow()
+
+    for user_id, change in delta.users.items():
+        row = connection.execute(
+            select(table).where(table.c.user_id == user_id).with_for_update()
+        ).first()
+
+        if row is None:
+            values = compute_summaries(connection, [user_id])[user_id]
+            try:
+                with connection.begin_nested():
+                    connection.execute(table.insert().values(user_id=user_id, updated_at=now, **values))
+                continue
+            except IntegrityError:
+                # A concurrent transaction created the row first; update it instead
+                row = connection.execute(
+                    select(table).where(table.c.user_id == user_id).with_for_update()
+                ).first()
+
+        connection.execute(table.update().where(table.c.user_id == user_id).values(
+            total_items=max(0, row.total_items + change['total']),
+            categories=_merge_counts(row.categories, change['categories']),
+            locations=_merge_counts(row.locations, change['locations']),
+            expiry_days=_merge_counts(row.expiry_days, change['expiry_days']),
+            updated_at=now
+        ))
+
+
+def _previous_value(item, field):
+    history = inspect(item).attrs[field].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(item, field)
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+# Load the old value before a tracked field is overwritten, even when the item was
+# expired by an earlier commit; otherwise the delta can't tell what to subtract
+for _field in TRACKED_FIELDS:
+    event.listen(getattr(InventoryItem, _field), 'set', _keep_old_value, active_history=True)
+
+
+@event.listens_for(Session, 'after_flush')
+def _update_inventory_summaries(session, flush_context):
+    """Fold InventoryItem inserts, updates and deletes from this flush into the summaries"""
+    delta = SummaryDelta()
+
+    for item in session.new:
+        if isinstance(item, InventoryItem):
+            delta.add(item.user_id, item.category, item.location, item.expiry_date)
+
+    for item in session.deleted:
+        if isinstance(item, InventoryItem):
+            delta.add(*(_previous_value(item, field) for field in TRACKED_FIELDS), sign=-1)
+
+    for item in session.dirty:
+        if not isinstance(item, InventoryItem):
+            continue
+        state = inspect(item)
+        if any(state.attrs[field].history.has_changes() for field in TRACKED_FIELDS):
+            delta.add(*(_previous_value(item, field) for field in TRACKED_FIELDS), sign=-1)
+            delta.add(item.user_id, item.category, item.location, item.expiry_date)
+
+    if delta:
+        apply_summary_delta(session.connection(), delta)
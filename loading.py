@@ -0,0 +1,45 @@
+"""Eager-loading strategies for queries that serialize related rows.
+
+Relationships keep the default lazy ("select") loading, so a single-row read
+pays nothing for children it never touches. A query that walks a relationship
+across many rows takes its loader options from here instead. Otherwise each
+row would issue its own lazy SELECT (N+1).
+
+- Collections (one-to-many) use ``selectinload``: one extra ``SELECT .. IN``
+  for the whole result, without duplicating parent rows.
+- References (many-to-one) use ``joinedload``: the related row comes back in
+  the same SELECT.
+
+Pair each with the matching ``to_dict(include_...=True)`` flag:
+
+    MealPlan.query.options(*meal_plans_with_items()).filter_by(user_id=uid)
+"""
+from sqlalchemy.orm import configure_mappers, joinedload, selectinload
+from src.models.recipe import Recipe, UserRecipe
+from src.models.preferences import MealPlan, MealPlanItem, ShoppingList
+
+
+def _configured():
+    # The collection attributes are backrefs, which exist only once mappers are configured
+    configure_mappers()
+
+
+def recipes_with_ingredients():
+    _configured()
+    return (selectinload(Recipe.ingredients),)
+
+
+def user_recipes_with_recipe():
+    _configured()
+    return (joinedload(UserRecipe.recipe),)
+
+
+def meal_plans_with_items(include_recipes=False):
+    _configured()
+    items = selectinload(MealPlan.meal_items)
+    return (items.joinedload(MealPlanItem.recipe),) if include_recipes else (items,)
+
+
+def shopping_lists_with_items():
+    _configured()
+    return (selectinload(ShoppingList.items),)
@@ -3,60 +3,129 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from src.models.user import db
-from src.routes.user import user_bp
-from src.routes.scanner import scanner_bp
-from src.routes.inventory import inventory_bp
-from src.routes.recipes import recipes_bp
-
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
-app.config['JWT_SECRET_KEY'] = 'jwt-secret-string-change-in-production'  # Change this in production!
-
-# Enable CORS for all routes
-CORS(app)
-
-# Initialize JWT
-jwt = JWTManager(app)
-
-# Register blueprints
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(scanner_bp, url_prefix='/api')
-app.register_blueprint(inventory_bp, url_prefix='/api')
-app.register_blueprint(recipes_bp, url_prefix='/api')
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-
-# Import all models to ensure they are registered with SQLAlchemy
-from src.models.inventory import InventoryItem
-from src.models.recipe import Recipe, RecipeIngredient, UserRecipe
-from src.models.preferences import UserPreferences, MealPlan, MealPlanItem, ShoppingList, ShoppingListItem
-
-with app.app_context():
-    db.create_all()
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+
+def create_app(config=None):
+    """Build and configure the Flask app.
+
+    Blueprints, models and extensions are imported here rather than at module
+    level, so importing ``src.main`` stays cheap for workers, the CLI and tests.
+    """
+    from flask import Flask
+    from flask_cors import CORS
+    from flask_jwt_extended import JWTManager
+    from src.models.user import db
+    from src.routes.user import user_bp
+    from src.routes.scanner import scanner_bp
+    from src.routes.inventory import inventory_bp
+    from src.routes.inventory_bulk import inventory_bulk_bp
+    from src.routes.inventory_stats import inventory_stats_bp
+    from src.routes.sync import sync_bp
+    from src.routes.recipes import recipes_bp, recipe_index, MOCK_RECIPES
+    from src.routes.admin import admin_bp
+    from src.routes.images import images_bp
+    from src.metrics import init_metrics
+    from src.security import init_auth
+    from src.profiling import init_profiling
+    from src.jobs.summary_reconciler import reconcile_inventory_summary_command
+    from src.jobs.archival import archive_data_command
+    from src.jobs.recommendations import recommend_recipes_command
+    from src.jobs.expiry_notifications import send_expiry_notifications_command
+    from src.static_assets import StaticManifest, compress_static_command
+    from src.image_store import init_image_store
+
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+    app.config['JWT_SECRET_KEY'] = 'jwt-secret-string-change-in-production'  # Change this in production!
+
+    # Database configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+        'DATABASE_URL',
+        f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+    )
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    if config:
+        app.config.update(config)
+
+    # Enable CORS for all routes
+    CORS(app)
+
+    # Per-endpoint latency, SQL and in-flight instrumentation, exposed at /metrics.
+    # Registered first so requests rejected by later hooks (429, 503) are still counted
+    init_metrics(app)
+
+    # Initialize JWT, with a cached user loader and rate-limited login/register
+    jwt = JWTManager(app)
+    init_auth(app, jwt)
+
+    # Opt-in request profiling (PROFILING_SAMPLE_RATE, or an X-Profile-Token signed with PROFILING_SECRET)
+    init_profiling(app)
+
+    # Content-addressed photo store (IMAGE_STORE_DIR); renditions are made at upload time
+    init_image_store(app)
+
+    # Register blueprints
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(scanner_bp, url_prefix='/api')
+    app.register_blueprint(inventory_bp, url_prefix='/api')
+    app.register_blueprint(inventory_bulk_bp, url_prefix='/api')
+    app.register_blueprint(inventory_stats_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
+    app.register_blueprint(recipes_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api')
+    app.register_blueprint(images_bp, url_prefix='/api')
+
+    # Similar-recipe index, built once per worker; catalog edits go through recipe_index.add_recipe/remove_recipe
+    recipe_index.build(MOCK_RECIPES)
+
+    db.init_app(app)
+
+    # Background jobs, run from cron: flask --app src.main <command>
+    app.cli.add_command(reconcile_inventory_summary_command)
+    app.cli.add_command(archive_data_command)
+    app.cli.add_command(recommend_recipes_command)
+    app.cli.add_command(send_expiry_notifications_command)
+    # Build step, run after copying a frontend build into static/
+    app.cli.add_command(compress_static_command)
+
+    # Import all models to ensure they are registered with SQLAlchemy
+    from src.models.inventory import InventoryItem
+    from src.models.inventory_summary import InventorySummary
+    from src.models.tombstone import Tombstone
+    from src.models.archive import ArchivedInventoryItem, ArchivedMealPlan, ArchivedShoppingList
+    from src.models.recommendation import UserRecommendation
+    from src.models.notification import ExpiryNotification
+    from src.models.recipe import Recipe, RecipeIngredient, UserRecipe
+    from src.models.preferences import UserPreferences, MealPlan, MealPlanItem, ShoppingList, ShoppingListItem
+    from src.models.schema import ensure_schema
+
+    # Skips create_all when the stored schema version matches the models
+    with app.app_context():
+        ensure_schema()
+
+    # Static files are indexed once at startup; compressed variants come from `compress-static`
+    static_manifest = StaticManifest(app.static_folder)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        if app.static_folder is None:
+                return "Static folder not configured", 404
+
+        return static_manifest.serve(path)
+
+    return app
+
+
+def __getattr__(name):
+    # `src.main:app` (gunicorn, flask --app) keeps working, but the app is
+    # only built when something actually asks for it
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    create_app().run(host='0.0.0.0', port=5001, debug=True)
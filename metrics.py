@@ -0,0 +1,374 @@
+"""Request timing and SQL instrumentation.
+
+``init_metrics(app)`` installs request hooks that record per-endpoint latency
+histograms, in-flight request gauges and per-request SQL query counts/time
+(via SQLAlchemy engine events), exposes them in Prometheus text format at
+``/metrics`` and adds a ``Server-Timing`` header to every response.
+
+Series live in process memory. Under a multi-process server (``gunicorn -w 4``)
+set ``METRICS_MULTIPROC_DIR`` to a directory shared by the workers. Each
+worker then writes a snapshot of its series there about once a second, and
+``/metrics`` returns the sum over all workers. Gauges from workers that have
+exited are dropped; counters and histograms are kept, so totals never go
+backwards. Empty the directory before the server starts. Without it, a scrape
+only sees whichever worker answered.
+
+``@query_budget(n)`` declares how many SQL statements a view may issue per
+request, so N+1 regressions show up before production. Over budget, a request
+raises ``QueryBudgetExceeded`` when ``QUERY_BUDGET_MODE`` is ``raise`` (the
+default under ``app.testing``). Otherwise it logs a warning and counts
+``http_query_budget_exceeded_total``.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus' default latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Directory shared by all worker processes; unset means single-process metrics
+MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+SNAPSHOT_INTERVAL = 1.0  # seconds
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def empty_copy(self):
+        return Histogram(self.name, self.documentation, self.label_names, self.buckets)
+
+    def snapshot(self):
+        with _lock:
+            return [[list(labels), {'buckets': list(series['buckets']), 'sum': series['sum'], 'count': series['count']}]
+                    for labels, series in self._series.items()]
+
+    def merge(self, entries):
+        """Add the series of another process's ``snapshot()``"""
+        with _lock:
+            for labels, other in entries:
+                labels = tuple(labels)
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                series['buckets'] = [a + b for a, b in zip(series['buckets'], other['buckets'])]
+                series['sum'] += other['sum']
+                series['count'] += other['count']
+
+    def observe(self, labels, value):
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with _lock:
+            for labels, series in sorted(self._series.items()):
+                base = _format_labels(self.label_names, labels)
+                for bound, count in zip(self.buckets, series['buckets']):
+                    lines.append(f'{self.name}_bucket{_with_le(base, bound)} {count}')
+                lines.append(f'{self.name}_bucket{_with_le(base, "+Inf")} {series["count"]}')
+                lines.append(f'{self.name}_sum{base} {series["sum"]}')
+                lines.append(f'{self.name}_count{base} {series["count"]}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter (or gauge, with ``kind='gauge'``) keyed by label values"""
+
+    def __init__(self, name, documentation, label_names, kind='counter'):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.kind = kind
+        self._values = defaultdict(float)
+
+    def empty_copy(self):
+        return Counter(self.name, self.documentation, self.label_names, self.kind)
+
+    def snapshot(self):
+        with _lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def merge(self, entries):
+        with _lock:
+            for labels, value in entries:
+                self._values[tuple(labels)] += value
+
+    def inc(self, labels, amount=1):
+        with _lock:
+            self._values[labels] += amount
+
+    def dec(self, labels, amount=1):
+        self.inc(labels, -amount)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with _lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _with_le(base, bound):
+    le = f'le="{bound}"'
+    return '{' + le + '}' if not base else base[:-1] + ',' + le + '}'
+
+
+REQUEST_LABELS = ('blueprint', 'endpoint', 'method')
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Request latency by endpoint.', REQUEST_LABELS, LATENCY_BUCKETS)
+requests_total = Counter(
+    'http_requests_total', 'Requests handled by endpoint and status.', REQUEST_LABELS + ('status',))
+requests_in_flight = Counter(
+    'http_requests_in_flight', 'Requests currently being handled.', ('blueprint',), kind='gauge')
+request_db_queries = Histogram(
+    'http_request_db_queries', 'SQL statements issued per request.', REQUEST_LABELS, QUERY_COUNT_BUCKETS)
+request_db_duration = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request.', REQUEST_LABELS, LATENCY_BUCKETS)
+query_budget_exceeded = Counter(
+    'http_query_budget_exceeded_total', 'Requests that issued more SQL statements than their budget.', REQUEST_LABELS)
+
+REGISTRY = [request_duration, requests_total, requests_in_flight, request_db_queries, request_db_duration,
+            query_budget_exceeded]
+
+
+def render_metrics():
+    """Render every registered metric in Prometheus text exposition format"""
+    registry = REGISTRY
+    if MULTIPROC_DIR:
+        write_snapshot()
+        registry = _merged_registry()
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def _snapshot_path(pid):
+    return os.path.join(MULTIPROC_DIR, f'metrics-{pid}.json')
+
+
+def write_snapshot():
+    """Write this process's series to the shared directory"""
+    data = {'pid': os.getpid(), 'metrics': {metric.name: metric.snapshot() for metric in REGISTRY}}
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=MULTIPROC_DIR, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, _snapshot_path(os.getpid()))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merged_registry():
+    merged = [metric.empty_copy() for metric in REGISTRY]
+    for name in os.listdir(MULTIPROC_DIR):
+        if not (name.startswith('metrics-') and name.endswith('.json')):
+            continue
+        try:
+            with open(os.path.join(MULTIPROC_DIR, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = _process_alive(data['pid'])
+        for metric in merged:
+            # An exited worker has nothing in flight
+            if metric.kind == 'gauge' and not alive:
+                continue
+            metric.merge(data['metrics'].get(metric.name, ()))
+    return merged
+
+
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+_dirty = False
+
+
+def _flush_snapshots():
+    global _dirty
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        if not _dirty:
+            continue
+        _dirty = False
+        try:
+            write_snapshot()
+        except OSError:
+            _dirty = True
+
+
+def _start_flusher():
+    """Start this process's snapshot thread; called lazily so it runs in each forked worker"""
+    global _flusher_pid
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        threading.Thread(target=_flush_snapshots, name='metrics-snapshot', daemon=True).start()
+        atexit.register(write_snapshot)
+        _flusher_pid = os.getpid()
+
+
+def _request_labels():
+    return (request.blueprint or 'app', request.endpoint or 'unmatched', request.method)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+    # Statements issued outside a request (startup, CLI jobs) are not attributed
+    if has_app_context() and 'metrics_start' in g:
+        g.metrics_db_queries += 1
+        g.metrics_db_time += elapsed
+
+
+def _before_request():
+    if MULTIPROC_DIR and _flusher_pid != os.getpid():
+        _start_flusher()
+    g.metrics_start = time.perf_counter()
+    g.metrics_db_queries = 0
+    g.metrics_db_time = 0.0
+    g.metrics_recorded = False
+    requests_in_flight.inc((request.blueprint or 'app',))
+
+
+def _record(status):
+    labels = _request_labels()
+    elapsed = time.perf_counter() - g.metrics_start
+    request_duration.observe(labels, elapsed)
+    requests_total.inc(labels + (str(status),))
+    request_db_queries.observe(labels, g.metrics_db_queries)
+    request_db_duration.observe(labels, g.metrics_db_time)
+    g.metrics_recorded = True
+    return elapsed
+
+
+def _after_request(response):
+    if 'metrics_start' not in g:
+        return response
+
+    elapsed = _record(response.status_code)
+    response.headers.add(
+        'Server-Timing',
+        f'app;dur={elapsed * 1000:.1f}, '
+        f'db;dur={g.metrics_db_time * 1000:.1f};desc="{g.metrics_db_queries} queries"'
+    )
+    return response
+
+
+def _teardown_request(exc):
+    if 'metrics_start' not in g:
+        return
+
+    # after_request is skipped for unhandled exceptions; count those as 500s
+    if not g.metrics_recorded:
+        _record(500)
+    requests_in_flight.dec((request.blueprint or 'app',))
+
+    global _dirty
+    _dirty = True
+
+
+def metrics_endpoint():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(limit):
+    """Declare the most SQL statements one request to the decorated view may issue.
+
+    The count covers the whole request so far, authentication included. Put
+    the decorator directly under ``@route`` so it wraps ``@jwt_required``.
+    ``limit`` may be a callable, evaluated after the view, for endpoints whose
+    statement count legitimately grows with the request body.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = current_app.ensure_sync(view)(*args, **kwargs)
+            _check_query_budget(limit() if callable(limit) else limit)
+            return response
+        wrapper.query_budget = limit
+        return wrapper
+    return decorator
+
+
+def _check_query_budget(limit):
+    if 'metrics_start' not in g or g.metrics_db_queries <= limit:
+        return
+
+    mode = current_app.config.get('QUERY_BUDGET_MODE') or ('raise' if current_app.testing else 'log')
+    if mode == 'off':
+        return
+    message = f'{request.method} {request.path} issued {g.metrics_db_queries} SQL statements (budget {limit})'
+    if mode == 'raise':
+        raise QueryBudgetExceeded(message)
+    query_budget_exceeded.inc(_request_labels())
+    current_app.logger.warning('Query budget exceeded: %s', message)
+
+
+def init_metrics(app):
+    """Install instrumentation hooks and the ``/metrics`` endpoint on ``app``"""
+    # raise, log or off; unset means raise under app.testing and log otherwise
+    app.config.setdefault('QUERY_BUDGET_MODE', os.environ.get('QUERY_BUDGET_MODE'))
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
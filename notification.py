@@ -0,0 +1,27 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+from src.models.user import db
+
+class ExpiryNotification(db.Model):
+    """Record of an expiry alert already handed to the notification sink; used to avoid repeats"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    inventory_item_id = db.Column(db.Integer, nullable=False)  # no FK: items may be archived later
+    expiry_date = db.Column(db.DateTime, nullable=False)  # a changed expiry date alerts again
+    sent_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.UniqueConstraint('inventory_item_id', 'expiry_date', name='unique_expiry_notification'),
+    )
+
+    def __repr__(self):
+        return f'<ExpiryNotification item={self.inventory_item_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'inventory_item_id': self.inventory_item_id,
+            'expiry_date': self.expiry_date.isoformat() if self.expiry_date else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
@@ -63,8 +63,9 @@ class MealPlan(db.Model):
     def __repr__(self):
         return f'<MealPlan {self.name}>'
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_items=False, include_recipes=False):
+        """Serialize; the include flags need ``meal_plans_with_items()`` when listing"""
+        data = {
             'id': self.id,
             'user_id': self.user_id,
             'name': self.name,
@@ -74,6 +75,9 @@ class MealPlan(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_items:
+            data['meal_items'] = [item.to_dict(include_recipe=include_recipes) for item in self.meal_items]
+        return data
 
 
 class MealPlanItem(db.Model):
@@ -85,6 +89,7 @@ class MealPlanItem(db.Model):
     servings = db.Column(db.Integer, nullable=False, default=1)
     is_completed = db.Column(db.Boolean, nullable=False, default=False)
     notes = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationships
     meal_plan = db.relationship('MealPlan', backref=db.backref('meal_items', lazy=True, cascade='all, delete-orphan'))
@@ -93,8 +98,8 @@ class MealPlanItem(db.Model):
     def __repr__(self):
         return f'<MealPlanItem {self.meal_type} on {self.meal_date}>'
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_recipe=False):
+        data = {
             'id': self.id,
             'meal_plan_id': self.meal_plan_id,
             'recipe_id': self.recipe_id,
@@ -102,8 +107,12 @@ class MealPlanItem(db.Model):
             'meal_type': self.meal_type,
             'servings': self.servings,
             'is_completed': self.is_completed,
-            'notes': self.notes
+            'notes': self.notes,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_recipe:
+            data['recipe'] = self.recipe.to_dict() if self.recipe else None
+        return data
 
 
 class ShoppingList(db.Model):
@@ -120,8 +129,9 @@ class ShoppingList(db.Model):
     def __repr__(self):
         return f'<ShoppingList {self.name}>'
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_items=False):
+        """Serialize; ``include_items`` needs ``shopping_lists_with_items()`` when listing"""
+        data = {
             'id': self.id,
             'user_id': self.user_id,
             'name': self.name,
@@ -129,6 +139,9 @@ class ShoppingList(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_items:
+            data['items'] = [item.to_dict() for item in self.items]
+        return data
 
 
 class ShoppingListItem(db.Model):
@@ -142,6 +155,7 @@ class ShoppingListItem(db.Model):
     estimated_price = db.Column(db.Float, nullable=True)
     actual_price = db.Column(db.Float, nullable=True)
     notes = db.Column(db.Text, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     # Relationship
     shopping_list = db.relationship('ShoppingList', backref=db.backref('items', lazy=True, cascade='all, delete-orphan'))
@@ -160,6 +174,7 @@ class ShoppingListItem(db.Model):
             'is_purchased': self.is_purchased,
             'estimated_price': self.estimated_price,
             'actual_price': self.actual_price,
-            'notes': self.notes
+            'notes': self.notes,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
@@ -0,0 +1,154 @@
+"""Opt-in cProfile capture for live requests.
+
+A request is profiled when either
+
+* ``PROFILING_SAMPLE_RATE`` (0.0 - 1.0) selects it at random, or
+* it carries an ``X-Profile-Token`` header signed with ``PROFILING_SECRET``
+  (mint one with ``flask --app src.main profile-token``).
+
+``PROFILING_SECRET`` must come from the environment. Without it, tokens are
+never accepted and the ``/api/admin/profiles`` endpoints answer 404.
+
+Profiles are written as ``.prof`` files (load them with ``pstats`` or
+snakeviz) into ``PROFILING_DIR``, which is kept as a ring buffer of at most
+``PROFILING_MAX_PROFILES`` files. When profiling is off the only per-request
+cost is one header lookup and, if a sample rate is set, one ``random()`` call.
+"""
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+
+import click
+from flask import current_app, g, request
+from itsdangerous import BadSignature, TimestampSigner
+
+PROFILE_HEADER = 'X-Profile-Token'
+TOKEN_SALT = 'request-profiling'
+TOKEN_MAX_AGE = 3600  # seconds
+PROFILE_NAME_RE = re.compile(r'^[\w.-]+\.prof$')
+
+_write_lock = threading.Lock()
+_sequence = 0
+
+
+def _signer(app):
+    return TimestampSigner(app.config['PROFILING_SECRET'], salt=TOKEN_SALT)
+
+
+def tokens_enabled(app):
+    return bool(app.config.get('PROFILING_SECRET'))
+
+
+def make_profile_token(app):
+    """Return a signed token that enables profiling (and the admin endpoints)"""
+    if not tokens_enabled(app):
+        raise RuntimeError('PROFILING_SECRET is not set')
+    return _signer(app).sign('profile').decode()
+
+
+def is_valid_token(app, token):
+    if not token or not tokens_enabled(app):
+        return False
+    try:
+        _signer(app).unsign(token, max_age=TOKEN_MAX_AGE)
+        return True
+    except BadSignature:
+        return False
+
+
+def profile_dir(app):
+    return app.config['PROFILING_DIR']
+
+
+def list_profiles(app):
+    """Return metadata for stored profiles, newest first"""
+    directory = profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for name in os.listdir(directory):
+        if not PROFILE_NAME_RE.match(name):
+            continue
+        stat = os.stat(os.path.join(directory, name))
+        profiles.append({'name': name, 'size': stat.st_size, 'created_at': stat.st_mtime})
+    profiles.sort(key=lambda p: p['name'], reverse=True)
+    return profiles
+
+
+def _save_profile(app, profiler, endpoint, elapsed):
+    global _sequence
+
+    directory = profile_dir(app)
+    os.makedirs(directory, exist_ok=True)
+    safe_endpoint = re.sub(r'[^\w.-]', '_', endpoint or 'unmatched')
+
+    with _write_lock:
+        _sequence += 1
+        name = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{_sequence:06d}-{safe_endpoint}-{int(elapsed * 1000)}ms.prof'
+        profiler.dump_stats(os.path.join(directory, name))
+
+        # Ring buffer: drop the oldest profiles beyond the limit
+        existing = sorted(n for n in os.listdir(directory) if PROFILE_NAME_RE.match(n))
+        for old in existing[:-app.config['PROFILING_MAX_PROFILES']]:
+            try:
+                os.remove(os.path.join(directory, old))
+            except OSError:
+                pass
+
+    return name
+
+
+def _before_request():
+    app = current_app._get_current_object()
+    token = request.headers.get(PROFILE_HEADER)
+    sample_rate = app.config['PROFILING_SAMPLE_RATE']
+
+    if token is None and (not sample_rate or random.random() >= sample_rate):
+        return
+    if token is not None and not is_valid_token(app, token):
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ allows one active profiler per process; another request already has it
+        return
+    g.profiler = profiler
+    g.profile_start = time.perf_counter()
+
+
+def _teardown_request(exc):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+
+    profiler.disable()
+    elapsed = time.perf_counter() - g.profile_start
+    try:
+        _save_profile(current_app, profiler, request.endpoint, elapsed)
+    except OSError as e:
+        current_app.logger.warning('Could not save request profile: %s', e)
+
+
+def init_profiling(app):
+    """Register the profiling hooks and the ``profile-token`` CLI command"""
+    app.config.setdefault('PROFILING_SAMPLE_RATE', float(os.environ.get('PROFILING_SAMPLE_RATE', 0)))
+    app.config.setdefault('PROFILING_DIR', os.environ.get(
+        'PROFILING_DIR', os.path.join(os.path.dirname(__file__), 'database', 'profiles')))
+    app.config.setdefault('PROFILING_MAX_PROFILES', int(os.environ.get('PROFILING_MAX_PROFILES', 50)))
+    app.config.setdefault('PROFILING_SECRET', os.environ.get('PROFILING_SECRET'))
+
+    app.before_request(_before_request)
+    app.teardown_request(_teardown_request)
+
+    @app.cli.command('profile-token')
+    def profile_token_command():
+        """Print a signed X-Profile-Token header value (valid for one hour)."""
+        if not tokens_enabled(app):
+            raise click.ClickException('Set PROFILING_SECRET to enable profile tokens')
+        click.echo(make_profile_token(app))
@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from src.models.user import db
+from src.image_store import thumbnail_url
 
 class Recipe(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -25,8 +26,9 @@ class Recipe(db.Model):
     def __repr__(self):
         return f'<Recipe {self.name}>'
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_ingredients=False):
+        """Serialize; ``include_ingredients`` needs ``recipes_with_ingredients()`` when listing"""
+        data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
@@ -39,6 +41,7 @@ class Recipe(db.Model):
             'calories_per_serving': self.calories_per_serving,
             'instructions': self.instructions,
             'image_url': self.image_url,
+            'thumbnail_url': thumbnail_url(self.image_url),
             'source': self.source,
             'external_id': self.external_id,
             'tags': self.tags,
@@ -46,6 +49,9 @@ class Recipe(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if include_ingredients:
+            data['ingredients'] = [ingredient.to_dict() for ingredient in self.ingredients]
+        return data
 
 
 class RecipeIngredient(db.Model):
@@ -97,8 +103,9 @@ class UserRecipe(db.Model):
     def __repr__(self):
         return f'<UserRecipe user_id={self.user_id} recipe_id={self.recipe_id}>'
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_recipe=False):
+        """Serialize; ``include_recipe`` needs ``user_recipes_with_recipe()`` when listing"""
+        data = {
             'id': self.id,
             'user_id': self.user_id,
             'recipe_id': self.recipe_id,
@@ -109,4 +116,7 @@ class UserRecipe(db.Model):
             'last_cooked': self.last_cooked.isoformat() if self.last_cooked else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+        if include_recipe:
+            data['recipe'] = self.recipe.to_dict() if self.recipe else None
+        return data
 
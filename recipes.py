@@ -3,12 +3,20 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 from src.models.user import db
 from src.models.inventory import InventoryItem
-from src.models.recipe import Recipe
+from src.models.recipe import Recipe, UserRecipe
 from src.models.preferences import UserPreferences
+from src.models.recommendation import UserRecommendation
+from src.similarity import RecipeSimilarityIndex
+from src.jobs.recommendations import compute_recommendations
+from src.metrics import query_budget
 import json
 
 recipes_bp = Blueprint('recipes', __name__)
 
+# MinHash/LSH index over recipe ingredients, built from MOCK_RECIPES in create_app
+recipe_index = RecipeSimilarityIndex()
+SIMILAR_RECIPES_LIMIT = 5
+
 # Mock recipe database - in production, this would be a real database or API
 MOCK_RECIPES = [
     {
@@ -144,6 +152,7 @@ MOCK_RECIPES = [
 ]
 
 @recipes_bp.route('/recipes', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_recipes():
     """Get recipes with optional filtering"""
@@ -190,6 +199,7 @@ def get_recipes():
         return jsonify({'error': str(e)}), 500
 
 @recipes_bp.route('/recipes/<int:recipe_id>', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_recipe(recipe_id):
     """Get a specific recipe by ID"""
@@ -204,7 +214,43 @@ def get_recipe(recipe_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@recipes_bp.route('/recipes/<int:recipe_id>/similar', methods=['GET'])
+@query_budget(1)
+@jwt_required()
+def get_similar_recipes(recipe_id):
+    """Get recipes with the most similar ingredient lists"""
+    try:
+        recipe = recipe_index.get(recipe_id)
+
+        if not recipe:
+            return jsonify({'error': 'Recipe not found'}), 404
+
+        limit = min(request.args.get('limit', SIMILAR_RECIPES_LIMIT, type=int), 20)
+        similar = find_similar_recipes([recipe_id], limit)
+
+        return jsonify({
+            'recipe_id': recipe_id,
+            'similar': similar,
+            'total': len(similar)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def find_similar_recipes(recipe_ids, limit=SIMILAR_RECIPES_LIMIT):
+    """Recipes similar to any of ``recipe_ids`` (excluding them), with a 'similarity' score"""
+    best = {}
+    for recipe_id in recipe_ids:
+        for similar_id, score in recipe_index.similar_to(recipe_id, limit=limit):
+            if similar_id not in recipe_ids and score > best.get(similar_id, 0):
+                best[similar_id] = score
+
+    ranked = sorted(best.items(), key=lambda pair: (-pair[1], pair[0]))[:limit]
+    return [dict(recipe_index.get(similar_id), similarity=round(score, 3))
+            for similar_id, score in ranked if similar_id in recipe_index.recipes]
+
 @recipes_bp.route('/recipes/generate', methods=['POST'])
+@query_budget(3)
 @jwt_required()
 def generate_recipes():
     """Generate recipe suggestions based on available ingredients"""
@@ -236,6 +282,7 @@ def generate_recipes():
         return jsonify({'error': str(e)}), 500
 
 @recipes_bp.route('/recipes/substitute', methods=['POST'])
+@query_budget(1)
 @jwt_required()
 def get_substitutions():
     """Get ingredient substitutions"""
@@ -257,42 +304,112 @@ def get_substitutions():
         return jsonify({'error': str(e)}), 500
 
 @recipes_bp.route('/recipes/favorites', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_favorite_recipes():
     """Get user's favorite recipes"""
     try:
-        current_user_id = get_jwt_identity()
-        
-        # In a real implementation, this would query the database
-        # For now, return a subset of recipes
-        favorites = MOCK_RECIPES[:3]  # Mock favorites
-        
+        current_user_id = int(get_jwt_identity())
+
+        favorite_ids = [row.recipe_id for row in db.session.query(UserRecipe.recipe_id).filter(
+            UserRecipe.user_id == current_user_id,
+            UserRecipe.is_favorite.is_(True)
+        ).order_by(UserRecipe.created_at.desc())]
+        favorites = [recipe_index.get(recipe_id) for recipe_id in favorite_ids if recipe_id in recipe_index.recipes]
+
         return jsonify({
             'favorites': favorites,
+            'alternatives': find_similar_recipes([r['id'] for r in favorites]),
             'total': len(favorites)
         }), 200
-        
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @recipes_bp.route('/recipes/<int:recipe_id>/favorite', methods=['POST'])
+@query_budget(7)  # includes copying the catalog recipe into the Recipe table on first use
 @jwt_required()
 def toggle_favorite(recipe_id):
     """Toggle recipe as favorite"""
     try:
-        current_user_id = get_jwt_identity()
-        
-        # In a real implementation, this would update the database
-        # For now, just return success
-        
+        current_user_id = int(get_jwt_identity())
+
+        recipe = next((r for r in MOCK_RECIPES if r['id'] == recipe_id), None)
+        if not recipe:
+            return jsonify({'error': 'Recipe not found'}), 404
+
+        ensure_recipe_row(recipe)
+        user_recipe = UserRecipe.query.filter_by(user_id=current_user_id, recipe_id=recipe_id).first()
+        if user_recipe is None:
+            user_recipe = UserRecipe(user_id=current_user_id, recipe_id=recipe_id, is_favorite=False)
+            db.session.add(user_recipe)
+        user_recipe.is_favorite = not user_recipe.is_favorite
+        db.session.commit()
+
         return jsonify({
             'message': 'Recipe favorite status updated',
-            'recipe_id': recipe_id
+            'recipe_id': recipe_id,
+            'is_favorite': user_recipe.is_favorite
         }), 200
-        
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@recipes_bp.route('/recipes/for-you', methods=['GET'])
+@query_budget(8)  # 2, or 8 when this user's ranking is computed inline
+@jwt_required()
+def get_recommended_recipes():
+    """Get the user's precomputed "For you" ranking"""
+    try:
+        current_user_id = int(get_jwt_identity())
+
+        recommendation = db.session.get(UserRecommendation, current_user_id)
+        if recommendation is None:
+            # New user the batch job has not reached yet: rank just this user now
+            compute_recommendations([current_user_id])
+            recommendation = db.session.get(UserRecommendation, current_user_id)
+
+        recipes = [
+            dict(recipe_index.get(entry['recipe_id']), score=entry['score'], reasons=entry['reasons'])
+            for entry in json.loads(recommendation.recipes)
+            if entry['recipe_id'] in recipe_index.recipes
+        ]
+
+        return jsonify({
+            'recipes': recipes,
+            'total': len(recipes),
+            'computed_at': recommendation.computed_at.isoformat(),
+            'stale': recommendation.stale
+        }), 200
+
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def ensure_recipe_row(recipe):
+    """Store a catalog recipe in the Recipe table so UserRecipe rows can reference it"""
+    if db.session.get(Recipe, recipe['id']) is None:
+        nutrition = recipe.get('nutrition', {})
+        db.session.add(Recipe(
+            id=recipe['id'],
+            name=recipe['name'],
+            description=recipe['description'],
+            cuisine_type=recipe['cuisine'],
+            difficulty_level=recipe['difficulty'],
+            prep_time=recipe['prep_time'],
+            cook_time=recipe['cook_time'],
+            total_time=recipe['prep_time'] + recipe['cook_time'],
+            servings=recipe['servings'],
+            calories_per_serving=nutrition.get('calories'),
+            instructions=json.dumps(recipe['instructions']),
+            image_url=recipe.get('image_url'),
+            source='catalog',
+            tags=json.dumps(recipe['dietary_tags']),
+            nutritional_info=json.dumps(nutrition)
+        ))
+        db.session.flush()
+
 def generate_recipe_suggestions(available_ingredients, preferences=None):
     """Generate recipe suggestions based on available ingredients and preferences"""
     
@@ -377,6 +494,7 @@ def get_ingredient_substitutions(ingredient):
     return result
 
 @recipes_bp.route('/recipes/nutrition/<int:recipe_id>', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_recipe_nutrition(recipe_id):
     """Get detailed nutrition information for a recipe"""
@@ -0,0 +1,53 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+import json
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.inventory import InventoryItem
+from src.models.recipe import UserRecipe
+from src.models.preferences import UserPreferences
+
+class UserRecommendation(db.Model):
+    """Precomputed "For you" recipe ranking for one user, written by the recommendations job"""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    recipes = db.Column(db.Text, nullable=False, default='[]')  # JSON array of {"recipe_id", "score", "reasons"}
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # when the inputs were read
+    inputs_changed_at = db.Column(db.DateTime, nullable=True)  # last history/preferences/inventory change
+
+    @property
+    def stale(self):
+        return self.inputs_changed_at is not None and self.inputs_changed_at > self.computed_at
+
+    def __repr__(self):
+        return f'<UserRecommendation user_id={self.user_id}>'
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'recipes': json.loads(self.recipes) if self.recipes else [],
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None,
+            'inputs_changed_at': self.inputs_changed_at.isoformat() if self.inputs_changed_at else None,
+            'stale': self.stale
+        }
+
+
+def mark_recommendations_stale(connection, user_ids):
+    """Flag users whose history, preferences or inventory changed for the next incremental run"""
+    if user_ids:
+        table = UserRecommendation.__table__
+        connection.execute(
+            update(table).where(table.c.user_id.in_(user_ids)).values(inputs_changed_at=datetime.utcnow())
+        )
+
+
+# Models whose changes feed into recommendations
+SIGNAL_MODELS = (UserRecipe, UserPreferences, InventoryItem)
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_changed_users(session, flush_context):
+    user_ids = {obj.user_id for obj in (*session.new, *session.dirty, *session.deleted)
+                if isinstance(obj, SIGNAL_MODELS) and obj.user_id is not None}
+    if user_ids:
+        mark_recommendations_stale(session.connection(), sorted(user_ids))
@@ -0,0 +1,225 @@
+"""Precompute personalised "For you" recipe rankings.
+
+Users are processed in shards of ``--shard-size`` across a pool of
+``--workers`` processes. Each worker builds its own app and database
+connection, and each shard costs a fixed number of queries no matter how
+many users it holds. By default only users who have no ranking yet, whose
+inputs changed after it was computed, or whose ranking is older than
+``--max-age-hours`` are refreshed. Run it from cron:
+
+    flask --app src.main recommend-recipes --workers 4 --shard-size 200
+"""
+import json
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+import multiprocessing
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import or_
+
+from src.models.user import db, User
+from src.models.inventory import InventoryItem
+from src.models.recipe import UserRecipe
+from src.models.preferences import UserPreferences
+from src.models.recommendation import UserRecommendation
+
+RECOMMENDATIONS_PER_USER = 20
+DEFAULT_MAX_AGE_HOURS = 24
+RECENTLY_COOKED_DAYS = 3
+
+# Score weights
+PANTRY_WEIGHT = 0.5
+HISTORY_WEIGHT = 0.4
+CUISINE_BONUS = 0.1
+DISLIKED_PENALTY = 0.2
+RECENTLY_COOKED_PENALTY = 0.3
+
+
+def _json_list(value):
+    try:
+        parsed = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return []
+    return [str(entry).lower() for entry in parsed] if isinstance(parsed, list) else []
+
+
+def _history_weight(user_recipe):
+    """How strongly one past interaction should pull similar recipes up (or push them down)"""
+    weight = 0.0
+    if user_recipe.is_favorite:
+        weight += 1.0
+    if user_recipe.rating:
+        weight += (user_recipe.rating - 3) / 2
+    weight += min(user_recipe.times_cooked or 0, 5) * 0.1
+    return weight
+
+
+def rank_recipes(catalog, index, pantry, preferences, history, now, limit=RECOMMENDATIONS_PER_USER):
+    """Score ``catalog`` for one user; return [{'recipe_id', 'score', 'reasons'}] best first.
+
+    ``pantry`` is a set of lower-cased inventory names, ``preferences`` a
+    UserPreferences row (or None) and ``history`` the user's UserRecipe rows.
+    """
+    allergies = _json_list(preferences.allergies) if preferences else []
+    disliked = _json_list(preferences.disliked_ingredients) if preferences else []
+    required_tags = _json_list(preferences.dietary_restrictions) if preferences else []
+    cuisines = set(_json_list(preferences.preferred_cuisines)) if preferences else set()
+    max_prep = preferences.max_prep_time if preferences else None
+    max_cook = preferences.max_cook_time if preferences else None
+
+    # Affinity from past interactions, spread to neighbours through the LSH index
+    affinity = defaultdict(float)
+    rejected = set()
+    recent = set()
+    for user_recipe in history:
+        if user_recipe.rating and user_recipe.rating <= 2:
+            rejected.add(user_recipe.recipe_id)
+        if user_recipe.last_cooked and user_recipe.last_cooked > now - timedelta(days=RECENTLY_COOKED_DAYS):
+            recent.add(user_recipe.recipe_id)
+        weight = _history_weight(user_recipe)
+        if weight:
+            for similar_id, similarity in index.similar_to(user_recipe.recipe_id, limit=20):
+                affinity[similar_id] += weight * similarity
+
+    ranked = []
+    for recipe in catalog:
+        recipe_id = recipe['id']
+        if recipe_id in rejected:
+            continue
+        if max_prep and recipe['prep_time'] > max_prep or max_cook and recipe['cook_time'] > max_cook:
+            continue
+        tags = set(recipe['dietary_tags'])
+        if required_tags and not all(tag in tags for tag in required_tags):
+            continue
+        ingredients = [ingredient.lower() for ingredient in recipe['ingredients']]
+        if any(allergen in ingredient for allergen in allergies for ingredient in ingredients):
+            continue
+
+        pantry_match = sum(1 for ingredient in ingredients if ingredient in pantry) / len(ingredients) if ingredients else 0
+        history_score = max(-1.0, min(1.0, affinity.get(recipe_id, 0.0)))
+        score = PANTRY_WEIGHT * pantry_match + HISTORY_WEIGHT * history_score
+
+        reasons = []
+        if pantry_match >= 0.5:
+            reasons.append('uses_your_inventory')
+        if history_score >= 0.2:
+            reasons.append('similar_to_favorites')
+        if recipe['cuisine'] in cuisines:
+            score += CUISINE_BONUS
+            reasons.append('preferred_cuisine')
+        if any(item in ingredient for item in disliked for ingredient in ingredients):
+            score -= DISLIKED_PENALTY
+        if recipe_id in recent:
+            score -= RECENTLY_COOKED_PENALTY
+
+        ranked.append({'recipe_id': recipe_id, 'score': round(score, 4), 'reasons': reasons})
+
+    ranked.sort(key=lambda entry: (-entry['score'], entry['recipe_id']))
+    return ranked[:limit]
+
+
+def compute_recommendations(user_ids, limit=RECOMMENDATIONS_PER_USER):
+    """Rank recipes for a shard of users and store the results; return how many were written"""
+    from src.routes.recipes import MOCK_RECIPES, recipe_index
+
+    started_at = datetime.utcnow()
+
+    # One query per input table for the whole shard
+    pantries = defaultdict(set)
+    for user_id, name in db.session.query(InventoryItem.user_id, InventoryItem.name).filter(
+        InventoryItem.user_id.in_(user_ids)
+    ):
+        pantries[user_id].add(name.lower())
+    preferences = {row.user_id: row for row in UserPreferences.query.filter(UserPreferences.user_id.in_(user_ids))}
+    histories = defaultdict(list)
+    for row in UserRecipe.query.filter(UserRecipe.user_id.in_(user_ids)):
+        histories[row.user_id].append(row)
+    existing = {row.user_id: row for row in UserRecommendation.query.filter(UserRecommendation.user_id.in_(user_ids))}
+
+    for user_id in user_ids:
+        ranked = rank_recipes(MOCK_RECIPES, recipe_index, pantries[user_id], preferences.get(user_id),
+                              histories[user_id], started_at, limit)
+        recommendation = existing.get(user_id)
+        if recommendation is None:
+            recommendation = UserRecommendation(user_id=user_id)
+            db.session.add(recommendation)
+        recommendation.recipes = json.dumps(ranked)
+        recommendation.computed_at = started_at
+
+    db.session.commit()
+    return len(user_ids)
+
+
+def iter_user_shards(shard_size, refresh_all=False, max_age_hours=DEFAULT_MAX_AGE_HOURS):
+    """Yield lists of user ids needing a refresh, keyset-paged by id"""
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    last_id = 0
+
+    while True:
+        query = db.session.query(User.id).filter(User.id > last_id, User.is_active.is_(True))
+        if not refresh_all:
+            query = query.outerjoin(UserRecommendation, UserRecommendation.user_id == User.id).filter(or_(
+                UserRecommendation.user_id.is_(None),
+                UserRecommendation.computed_at < cutoff,
+                UserRecommendation.inputs_changed_at > UserRecommendation.computed_at
+            ))
+        user_ids = [row.id for row in query.order_by(User.id).limit(shard_size)]
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+_worker_app_context = None
+
+
+def _init_worker(database_uri):
+    """Process pool initializer: give each worker its own app, engine and app context"""
+    global _worker_app_context
+    from src.main import create_app
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_uri})
+    _worker_app_context = app.app_context()
+    _worker_app_context.push()
+
+
+def run_recommendations(workers=4, shard_size=200, refresh_all=False, max_age_hours=DEFAULT_MAX_AGE_HOURS):
+    """Refresh rankings for every user that needs it; return the number of users processed"""
+    shards = iter_user_shards(shard_size, refresh_all, max_age_hours)
+    database_uri = current_app.config['SQLALCHEMY_DATABASE_URI']
+
+    if workers <= 1 or database_uri in ('sqlite://', 'sqlite:///:memory:'):
+        return sum(compute_recommendations(shard) for shard in shards)
+
+    processed = 0
+    # spawn, not fork: workers must not inherit the parent's pooled connections or threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(database_uri,)) as pool:
+        pending = set()
+        for shard in shards:
+            # Keep a bounded number of shards in flight so memory stays flat
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                processed += sum(future.result() for future in done)
+            pending.add(pool.submit(compute_recommendations, shard))
+        processed += sum(future.result() for future in pending)
+
+    return processed
+
+
+@click.command('recommend-recipes')
+@click.option('--workers', default=4, show_default=True, help='Worker processes (1 = run inline).')
+@click.option('--shard-size', default=200, show_default=True, help='Users per shard and transaction.')
+@click.option('--all', 'refresh_all', is_flag=True, help='Recompute every user, not only stale ones.')
+@click.option('--max-age-hours', default=DEFAULT_MAX_AGE_HOURS, show_default=True,
+              help='Recompute rankings older than this even if nothing changed.')
+@with_appcontext
+def recommend_recipes_command(workers, shard_size, refresh_all, max_age_hours):
+    """Precompute "For you" recipe rankings."""
+    processed = run_recommendations(workers, shard_size, refresh_all, max_age_hours)
+    current_app.logger.info('Recomputed recommendations for %d users', processed)
+    click.echo(f'Recomputed recommendations for {processed} users.')
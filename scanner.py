@@ -2,11 +2,12 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import base64
 import io
-from PIL import Image
 import json
 from datetime import datetime, timedelta
 from src.models.user import db
 from src.models.inventory import InventoryItem
+from src.image_store import get_image_store
+from src.metrics import query_budget
 
 scanner_bp = Blueprint('scanner', __name__)
 
@@ -87,7 +88,21 @@ def analyze_food_image(image_data, mode='single'):
             'recipes': mock_recipes
         }
 
+def load_image(image_data):
+    """Decode image bytes with PIL and normalise to RGB"""
+    # PIL is imported on first use so it stays out of worker startup time
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_data))
+
+    # Convert to RGB if necessary
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    return image
+
 @scanner_bp.route('/scan', methods=['POST'])
+@query_budget(1)
 @jwt_required()
 def scan_image():
     """Scan an image to identify food items"""
@@ -107,15 +122,16 @@ def scan_image():
         # Read and process the image
         try:
             image_data = image_file.read()
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+
+            image = load_image(image_data)
+            stored = get_image_store().ingest(image_data, image)
             
             # Here you would integrate with actual computer vision API
             # For now, we'll use mock data
             analysis_result = analyze_food_image(image_data, mode)
+            analysis_result['image'] = stored
+            if 'item' in analysis_result:
+                analysis_result['item'] = dict(analysis_result['item'], image_url=stored['urls']['medium'])
             
             return jsonify(analysis_result), 200
             
@@ -126,6 +142,7 @@ def scan_image():
         return jsonify({'error': str(e)}), 500
 
 @scanner_bp.route('/scan/history', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_scan_history():
     """Get user's scan history"""
@@ -0,0 +1,60 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+import hashlib
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db
+
+class SchemaVersion(db.Model):
+    """Single-row record of the model fingerprint the database was last created from"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.String(64), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SchemaVersion {self.version}>'
+
+
+def schema_fingerprint(metadata):
+    """Hash table, column, index and constraint definitions of the registered models"""
+    parts = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f'table {table.name}')
+        for column in table.columns:
+            parts.append(f'  {column.name} {column.type} nullable={column.nullable} pk={column.primary_key}')
+        for index in sorted(table.indexes, key=lambda i: i.name or ''):
+            parts.append(f'  index {index.name} {sorted(c.name for c in index.columns)} unique={index.unique}')
+        for constraint in sorted(table.constraints, key=lambda c: c.name or type(c).__name__):
+            parts.append(f'  constraint {type(constraint).__name__} {constraint.name} {sorted(c.name for c in constraint.columns)}')
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+
+def ensure_schema():
+    """Run create_all only when the models changed since the database was last created.
+
+    Reading one row replaces create_all's per-table introspection on every
+    startup. Note create_all only adds missing tables; it does not alter
+    existing ones.
+    """
+    fingerprint = schema_fingerprint(db.metadata)
+
+    try:
+        current = db.session.get(SchemaVersion, 1)
+    except Exception:
+        # Fresh database: the version table itself does not exist yet
+        db.session.rollback()
+        current = None
+
+    if current is not None and current.version == fingerprint:
+        return False
+
+    db.create_all()
+    if current is None:
+        db.session.add(SchemaVersion(id=1, version=fingerprint))
+    else:
+        current.version = fingerprint
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker starting at the same time recorded it first
+        db.session.rollback()
+    return True
@@ -0,0 +1,228 @@
+"""Password hashing executor, login rate limiting and the cached JWT user loader.
+
+PBKDF2 hashing is CPU-heavy by design. Running it on a small bounded pool
+caps how many cores a burst of logins can take. Login and register requests
+take a hashing slot before the view runs; once the queue limit is reached they
+get a 503 instead of stalling every other request on the worker.
+
+Authenticated requests resolve their ``User`` through a short-TTL identity
+cache. Entries are dropped when a user's ``is_active`` flag or password
+changes, and the TTL bounds staleness across worker processes.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import g, has_request_context, jsonify, request
+from sqlalchemy import event, inspect
+
+HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', max(2, (os.cpu_count() or 2) // 2)))
+HASH_QUEUE_LIMIT = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT', HASH_WORKERS * 8))
+HASH_TIMEOUT = 30  # seconds
+
+IDENTITY_CACHE_TTL = 30  # seconds
+IDENTITY_CACHE_SIZE = 10000
+
+# (limit, window in seconds)
+LOGIN_LIMIT_PER_IP = (20, 60)
+LOGIN_LIMIT_PER_ACCOUNT = (5, 60)
+RATE_LIMITED_PATHS = ('/api/login', '/api/register')
+# Only for load tests, where every simulated user logs in from the same address
+RATE_LIMIT_ENABLED = os.environ.get('LOGIN_RATE_LIMIT_ENABLED', '1') != '0'
+
+
+class HashingOverloaded(Exception):
+    """Raised when too many password hashes are already queued"""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(HASH_QUEUE_LIMIT)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix='password-hash')
+    return _executor
+
+
+def run_password_hash(fn, *args):
+    """Run a werkzeug hash/check function on the bounded hashing pool and wait for it"""
+    if has_request_context() and g.get('hash_slot'):
+        # _reserve_hash_slot already admitted this request
+        return _get_executor().submit(fn, *args).result(timeout=HASH_TIMEOUT)
+    if not _pending.acquire(blocking=False):
+        raise HashingOverloaded()
+    try:
+        return _get_executor().submit(fn, *args).result(timeout=HASH_TIMEOUT)
+    finally:
+        _pending.release()
+
+
+class RateLimiter:
+    """Fixed-window request counter per key, kept in process memory"""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        """Count one attempt for ``key``; return False once the limit is exceeded"""
+        now = time.monotonic()
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+            if now - start >= self.window:
+                start, count = now, 0
+            self._windows[key] = (start, count + 1)
+
+            # Keep memory bounded under a flood of distinct keys
+            if len(self._windows) > 100000:
+                self._windows = {k: v for k, v in self._windows.items() if now - v[0] < self.window}
+
+            return count + 1 <= self.limit
+
+
+ip_limiter = RateLimiter(*LOGIN_LIMIT_PER_IP)
+account_limiter = RateLimiter(*LOGIN_LIMIT_PER_ACCOUNT)
+
+
+def _rate_limit_login():
+    if not RATE_LIMIT_ENABLED or request.method != 'POST' or request.path not in RATE_LIMITED_PATHS:
+        return None
+
+    data = request.get_json(silent=True) or {}
+    account = (data.get('username') or data.get('email') or '').strip().lower()
+
+    # Hit both limiters so each attempt is counted against the IP and the account
+    ip_ok = ip_limiter.hit(request.remote_addr)
+    account_ok = account_limiter.hit(account) if account else True
+    if not (ip_ok and account_ok):
+        return jsonify({'error': 'Too many attempts, please try again later'}), 429
+    return None
+
+
+def _reserve_hash_slot():
+    """Admit a login/register request only if a hashing slot is free.
+
+    Done before the view runs because the views turn any exception, including
+    ``HashingOverloaded``, into a 500.
+    """
+    if request.method != 'POST' or request.path not in RATE_LIMITED_PATHS:
+        return None
+    if not _pending.acquire(blocking=False):
+        return jsonify({'error': 'Server busy, please try again'}), 503
+    g.hash_slot = True
+    return None
+
+
+def _release_hash_slot(exc):
+    if g.pop('hash_slot', False):
+        _pending.release()
+
+
+class IdentityCache:
+    """TTL cache of detached ``User`` rows keyed by id"""
+
+    def __init__(self, ttl, max_size):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            return user
+
+    def set(self, user_id, user):
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+identity_cache = IdentityCache(IDENTITY_CACHE_TTL, IDENTITY_CACHE_SIZE)
+
+
+def load_user(jwt_header, jwt_data):
+    """JWT user_lookup_loader: resolve the token subject, rejecting inactive users"""
+    from src.models.user import db, User
+
+    try:
+        user_id = int(jwt_data['sub'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    cached = identity_cache.get(user_id)
+    if cached is not None:
+        # Attach a copy to this request's session without re-querying
+        return db.session.merge(cached, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is None or not user.is_active:
+        return None
+
+    db.session.expunge(user)
+    identity_cache.set(user_id, user)
+    return db.session.merge(user, load=False)
+
+
+def _track_identity_changes(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.is_active.history.has_changes() or state.attrs.password_hash.history.has_changes():
+        state.session.info.setdefault('identity_changes', set()).add(target.id)
+
+
+def _track_identity_delete(mapper, connection, target):
+    inspect(target).session.info.setdefault('identity_changes', set()).add(target.id)
+
+
+def _invalidate_identities(session):
+    for user_id in session.info.pop('identity_changes', ()):
+        identity_cache.invalidate(user_id)
+
+
+def _discard_identity_changes(session, previous_transaction):
+    session.info.pop('identity_changes', None)
+
+
+def init_auth(app, jwt):
+    """Wire the cached user loader, login rate limits and hashing back-pressure into ``app``"""
+    from sqlalchemy.orm import Session
+    from src.models.user import User
+
+    jwt.user_lookup_loader(load_user)
+    app.before_request(_rate_limit_login)
+    app.before_request(_reserve_hash_slot)
+    app.teardown_request(_release_hash_slot)
+
+    @app.errorhandler(HashingOverloaded)
+    def hashing_overloaded(e):
+        return jsonify({'error': 'Server busy, please try again'}), 503
+
+    if not event.contains(User, 'after_update', _track_identity_changes):
+        event.listen(User, 'after_update', _track_identity_changes)
+        event.listen(User, 'after_delete', _track_identity_delete)
+        # Only drop cache entries once the change is actually committed
+        event.listen(Session, 'after_commit', _invalidate_identities)
+        event.listen(Session, 'after_soft_rollback', _discard_identity_changes)
@@ -0,0 +1,204 @@
+"""In-memory manifest for the Vite-built static folder.
+
+The manifest is built once at startup: every file is hashed for its ETag and
+small files are kept in memory. Requests are then answered from the manifest
+without touching the filesystem for existence checks.
+
+Compression happens at build time, not in each worker. After ``npm run build``
+copies the frontend into ``static/``, ``flask --app src.main compress-static``
+writes ``.gz`` (and ``.br``, when the optional ``brotli`` package is
+installed) files next to each compressible asset. The manifest serves those
+variants by ``Accept-Encoding`` and ignores any older than their source.
+
+Vite emits content-hashed filenames under ``assets/`` (``index-3f9a1c2b.js``);
+those are served with a one-year ``immutable`` cache lifetime. Everything else,
+``index.html`` in particular, is served with ``no-cache`` so browsers
+revalidate with ``If-None-Match`` and get a 304 straight from memory.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+import click
+from flask import current_app, request, send_file
+from flask.cli import with_appcontext
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Vite's default output name: assets/[name]-[hash].[ext] with an 8-character hash
+HASHED_ASSET_RE = re.compile(r'^assets/(?:.+/)?[^/]+-[A-Za-z0-9_-]{8}\.(?:js|mjs|css|woff2?|ttf|svg|png|jpe?g|gif|webp|avif|ico|wasm|map)$')
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml',
+                      'application/wasm', 'application/xml', 'application/manifest+json')
+MIN_COMPRESS_SIZE = 1024
+MAX_INLINE_SIZE = 1024 * 1024
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+
+class StaticAsset:
+    __slots__ = ('path', 'full_path', 'mimetype', 'etag', 'size', 'immutable', 'body', 'variants')
+
+    def __init__(self, path, full_path, mimetype, etag, size, immutable, body, variants):
+        self.path = path
+        self.full_path = full_path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.size = size
+        self.immutable = immutable
+        self.body = body  # None for files too large to keep in memory
+        self.variants = variants  # encoding -> compressed bytes
+
+
+def _is_compressible(mimetype):
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def _compress(data):
+    """encoding -> compressed bytes, for the encodings that actually shrink ``data``"""
+    variants = {}
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) < len(data):
+        variants['gzip'] = compressed
+    if brotli is not None:
+        compressed = brotli.compress(data, quality=11)
+        if len(compressed) < len(data):
+            variants['br'] = compressed
+    return variants
+
+
+def _load_variants(full_path):
+    variants = {}
+    source_mtime = os.stat(full_path).st_mtime
+    for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+        variant_path = full_path + suffix
+        # A variant older than its source is left over from a previous build
+        if os.path.isfile(variant_path) and os.stat(variant_path).st_mtime >= source_mtime:
+            with open(variant_path, 'rb') as f:
+                variants[encoding] = f.read()
+    return variants
+
+
+def _is_variant(full_path):
+    root, suffix = os.path.splitext(full_path)
+    return suffix in PRECOMPRESSED_SUFFIXES.values() and os.path.isfile(root)
+
+
+def _load_asset(static_folder, path):
+    full_path = os.path.join(static_folder, path)
+    with open(full_path, 'rb') as f:
+        data = f.read()
+
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    etag = hashlib.sha1(data).hexdigest()[:20]
+    variants = _load_variants(full_path) if _is_compressible(mimetype) else {}
+
+    return StaticAsset(
+        path=path,
+        full_path=full_path,
+        mimetype=mimetype,
+        etag=etag,
+        size=len(data),
+        immutable=bool(HASHED_ASSET_RE.search(path)),
+        body=data if len(data) <= MAX_INLINE_SIZE else None,
+        variants=variants
+    )
+
+
+class StaticManifest:
+    """Path -> ``StaticAsset`` lookup for a static folder"""
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self.assets = {}
+        if static_folder:
+            self.build()
+
+    def build(self):
+        assets = {}
+        if os.path.isdir(self.static_folder):
+            for root, _, files in os.walk(self.static_folder):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    if _is_variant(full_path):
+                        continue
+                    path = os.path.relpath(full_path, self.static_folder).replace(os.sep, '/')
+                    assets[path] = _load_asset(self.static_folder, path)
+        self.assets = assets
+        return assets
+
+    def lookup(self, path):
+        asset = self.assets.get(path)
+        # Under the dev server the folder may change after startup; pick up new files
+        if asset is None and current_app.debug:
+            # safe_join rejects '..' and absolute paths that would escape the static folder
+            full_path = safe_join(self.static_folder, path)
+            if full_path is None or not os.path.isfile(full_path):
+                return None
+            asset = self.assets[path] = _load_asset(self.static_folder, path)
+        return asset
+
+    def serve(self, path):
+        """Serve ``path`` from the manifest, falling back to ``index.html`` for client-side routes"""
+        asset = self.lookup(path) if path else None
+        if asset is None:
+            asset = self.lookup('index.html')
+            if asset is None:
+                return "index.html not found", 404
+        return self._response(asset)
+
+    def _response(self, asset):
+        encoding = None
+        for candidate in ('br', 'gzip'):
+            if candidate in asset.variants and request.accept_encodings[candidate]:
+                encoding = candidate
+                break
+
+        if encoding:
+            response = current_app.response_class(asset.variants[encoding], mimetype=asset.mimetype)
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f'{asset.etag}-{encoding}')
+            response.make_conditional(request)
+        elif asset.body is not None:
+            response = current_app.response_class(asset.body, mimetype=asset.mimetype)
+            response.set_etag(asset.etag)
+            response.make_conditional(request, accept_ranges=True, complete_length=asset.size)
+        else:
+            response = send_file(asset.full_path, mimetype=asset.mimetype, etag=asset.etag, conditional=True)
+
+        if asset.variants:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE if asset.immutable else REVALIDATE_CACHE
+        return response
+
+
+@click.command('compress-static')
+@with_appcontext
+def compress_static_command():
+    """Write .gz and .br variants next to compressible static files. Run after each frontend build."""
+    static_folder = current_app.static_folder
+    written = 0
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            full_path = os.path.join(root, name)
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if _is_variant(full_path) or not _is_compressible(mimetype) or os.path.getsize(full_path) < MIN_COMPRESS_SIZE:
+                continue
+
+            with open(full_path, 'rb') as f:
+                variants = _compress(f.read())
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+                variant_path = full_path + suffix
+                if encoding in variants:
+                    with open(variant_path, 'wb') as f:
+                        f.write(variants[encoding])
+                    written += 1
+                elif os.path.exists(variant_path):
+                    os.remove(variant_path)
+    click.echo(f'Wrote {written} compressed variants under {static_folder}')
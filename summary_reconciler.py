@@ -0,0 +1,76 @@
+"""Recompute inventory summaries from InventoryItem rows and repair drift.
+
+The flush-event counters in ``src.models.inventory_summary`` can drift if rows
+are changed outside the ORM (manual SQL, restores, bulk statements that skip
+the delta helpers). Run this from cron:
+
+    flask --app src.main reconcile-inventory-summary --batch-size 500
+"""
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from src.models.user import db, User
+from src.models.inventory_summary import InventorySummary, compute_summaries
+
+
+def reconcile_users(user_ids):
+    """Overwrite the summaries of ``user_ids`` with freshly computed values; return how many had drifted"""
+    actual = compute_summaries(db.session.connection(), user_ids)
+    stored = {summary.user_id: summary for summary in
+              InventorySummary.query.filter(InventorySummary.user_id.in_(user_ids))}
+    now = datetime.utcnow()
+    drifted = 0
+
+    for user_id, values in actual.items():
+        summary = stored.get(user_id)
+        if summary is None:
+            if not values['total_items']:
+                continue
+            summary = InventorySummary(user_id=user_id)
+            db.session.add(summary)
+        elif all(getattr(summary, field) == value for field, value in values.items()):
+            summary.reconciled_at = now
+            continue
+
+        drifted += 1
+        for field, value in values.items():
+            setattr(summary, field, value)
+        summary.reconciled_at = now
+
+    return drifted
+
+
+def reconcile_inventory_summaries(batch_size=500, pause=0.0):
+    """Walk all users in id order, one short transaction per batch"""
+    last_id = 0
+    checked = drifted = 0
+
+    while True:
+        user_ids = [row.id for row in db.session.query(User.id).filter(User.id > last_id).order_by(User.id).limit(batch_size)]
+        if not user_ids:
+            break
+
+        drifted += reconcile_users(user_ids)
+        db.session.commit()
+        checked += len(user_ids)
+        last_id = user_ids[-1]
+
+        if pause:
+            time.sleep(pause)
+
+    return checked, drifted
+
+
+@click.command('reconcile-inventory-summary')
+@click.option('--batch-size', default=500, show_default=True, help='Users per transaction.')
+@click.option('--pause', default=0.0, show_default=True, help='Seconds to sleep between batches.')
+@with_appcontext
+def reconcile_inventory_summary_command(batch_size, pause):
+    """Recompute per-user inventory summaries and repair any drift."""
+    checked, drifted = reconcile_inventory_summaries(batch_size, pause)
+    current_app.logger.info('Reconciled %d inventory summaries, %d had drifted', checked, drifted)
+    click.echo(f'Checked {checked} users, repaired {drifted} summaries.')
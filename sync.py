@@ -0,0 +1,92 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime, timedelta, timezone
+from src.models.user import db
+from src.models.inventory import InventoryItem
+from src.models.preferences import MealPlan, MealPlanItem, ShoppingList, ShoppingListItem
+from src.models.tombstone import Tombstone, TOMBSTONE_RETENTION_DAYS
+from src.metrics import query_budget
+
+sync_bp = Blueprint('sync', __name__)
+
+# The next cursor is moved back by this much so rows committed late, with a
+# slightly older updated_at (long transactions, clock skew between workers),
+# are still picked up. Clients upsert by id, so repeats are harmless.
+SYNC_OVERLAP_SECONDS = 5
+
+def owned_inventory_items(user_id):
+    return InventoryItem.query.filter(InventoryItem.user_id == user_id)
+
+def owned_meal_plan_items(user_id):
+    return MealPlanItem.query.join(MealPlan).filter(MealPlan.user_id == user_id)
+
+def owned_shopping_list_items(user_id):
+    return ShoppingListItem.query.join(ShoppingList).filter(ShoppingList.user_id == user_id)
+
+# Response key -> (model, query of the rows a user owns)
+SYNC_COLLECTIONS = {
+    'inventory_items': (InventoryItem, owned_inventory_items),
+    'meal_plan_items': (MealPlanItem, owned_meal_plan_items),
+    'shopping_list_items': (ShoppingListItem, owned_shopping_list_items),
+}
+
+@sync_bp.route('/sync', methods=['GET'])
+@query_budget(5)
+@jwt_required()
+def sync():
+    """Rows changed and deleted since a cursor.
+
+    Query: ?since=<cursor from the last response>&include=inventory_items,meal_plan_items
+    Without ``since`` (or with one older than the tombstone retention) a full
+    snapshot is returned with "full": true and the client should replace its copy.
+    """
+    try:
+        current_user_id = int(get_jwt_identity())
+        started_at = datetime.utcnow()
+
+        include = request.args.get('include')
+        names = include.split(',') if include else list(SYNC_COLLECTIONS)
+        unknown = [name for name in names if name not in SYNC_COLLECTIONS]
+        if unknown:
+            return jsonify({'error': f'Unknown collection: {", ".join(unknown)}'}), 400
+
+        since = None
+        if request.args.get('since'):
+            try:
+                since = datetime.fromisoformat(request.args['since'])
+            except ValueError:
+                return jsonify({'error': 'since must be a cursor returned by /api/sync'}), 400
+            # Timestamps are stored as naive UTC; accept offsets such as a trailing Z
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+        full = since is None or since < started_at - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+
+        deleted = {}
+        if not full:
+            tombstones = db.session.query(Tombstone.entity, Tombstone.entity_id).filter(
+                Tombstone.user_id == current_user_id,
+                Tombstone.deleted_at > since
+            )
+            for entity, entity_id in tombstones:
+                deleted.setdefault(entity, set()).add(entity_id)
+
+        response = {
+            'cursor': (started_at - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat(),
+            'full': full
+        }
+        for name in names:
+            model, owned = SYNC_COLLECTIONS[name]
+            query = owned(current_user_id)
+            if not full:
+                query = query.filter(model.updated_at > since)
+
+            response[name] = {
+                'changed': [row.to_dict() for row in query.order_by(model.id)],
+                'deleted': sorted(deleted.get(model.__tablename__, ()))
+            }
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,79 @@
+import os
+import time
+
+import pytest
+
+from src.main import create_app
+from src.models.user import db, User
+from src.models.inventory import InventoryItem
+from src.models.preferences import ShoppingList
+from src.models.archive import ArchivedInventoryItem, ArchivedShoppingList
+from src.image_store import get_image_store
+from src.jobs.archival import IMAGE_GRACE_DAYS, run_archival
+from benchmarks.datagen import generate_image
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'IMAGE_STORE_DIR': str(tmp_path / 'images'),
+    })
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def user(app):
+    user = User(username='archiver', email='archiver@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_rearchiving_a_reused_inventory_id(user):
+    db.session.add(InventoryItem(user_id=user.id, name='milk', category='dairy', quantity=0))
+    db.session.commit()
+    assert run_archival(pause=0)['inventory_items'] == 1
+
+    # SQLite hands the deleted row's id to the next insert
+    item = InventoryItem(user_id=user.id, name='eggs', category='dairy', quantity=0)
+    db.session.add(item)
+    db.session.commit()
+    reused_id = item.id
+
+    assert run_archival(pause=0)['inventory_items'] == 1
+    archived = ArchivedInventoryItem.query.filter_by(original_id=reused_id).order_by(ArchivedInventoryItem.id).all()
+    assert [row.name for row in archived] == ['milk', 'eggs']
+
+
+def test_rearchiving_a_reused_shopping_list_id(user):
+    db.session.add(ShoppingList(user_id=user.id, name='week 1', is_completed=True))
+    db.session.commit()
+    assert run_archival(pause=0, completed_days=-1)['shopping_lists'] == 1
+
+    db.session.add(ShoppingList(user_id=user.id, name='week 2', is_completed=True))
+    db.session.commit()
+
+    assert run_archival(pause=0, completed_days=-1)['shopping_lists'] == 1
+    assert ArchivedShoppingList.query.count() == 2
+
+
+def test_sweep_removes_only_unreferenced_images_past_grace(app, user):
+    store = get_image_store()
+    kept = store.ingest(generate_image(seed=1))
+    orphan = store.ingest(generate_image(seed=2))
+    recent = store.ingest(generate_image(seed=3))
+    db.session.add(InventoryItem(user_id=user.id, name='apple', category='fruits',
+                                 image_url=kept['urls']['medium']))
+    db.session.commit()
+
+    past_grace = time.time() - (IMAGE_GRACE_DAYS + 1) * 86400
+    for stored in (kept, orphan):
+        os.utime(store.directory(stored['digest']), (past_grace, past_grace))
+
+    assert run_archival(pause=0)['images'] == 1
+    assert store.path(kept['digest'], 'thumb') is not None
+    assert store.path(orphan['digest'], 'thumb') is None
+    assert store.path(recent['digest'], 'thumb') is not None
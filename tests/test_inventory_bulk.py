@@ -0,0 +1,143 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from src.main import create_app
+from src.models.user import db, User
+from src.models.inventory import InventoryItem
+from src.models.inventory_summary import InventorySummary
+from src.models.tombstone import Tombstone
+from src.jobs.summary_reconciler import reconcile_users
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'IMAGE_STORE_DIR': str(tmp_path / 'images'),
+    })
+    with app.app_context():
+        yield app
+
+
+def make_user(name):
+    user = User(username=name, email=f'{name}@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def user(app):
+    return make_user('bulk')
+
+
+@pytest.fixture
+def post_bulk(app, user):
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def post(body):
+        response = client.post('/api/inventory/bulk', json=body, headers=headers)
+        return response.status_code, response.get_json()
+    return post
+
+
+def add_item(user, **fields):
+    item = InventoryItem(user_id=user.id, **dict({'name': 'milk', 'category': 'dairy'}, **fields))
+    db.session.add(item)
+    db.session.commit()
+    return item.id
+
+
+def test_invalid_entry_rejects_the_whole_batch(user, post_bulk):
+    milk_id = add_item(user)
+
+    status, body = post_bulk({
+        'create': [{'name': 'eggs'}, {'quantity': -1}],
+        'update': [{'id': milk_id, 'location': 'fridge'}],
+        'delete': [],
+    })
+
+    assert status == 400
+    assert [result['status'] for result in body['results']['create']] == ['created', 'invalid']
+    assert body['results']['create'][1]['errors'] == ['name is required', 'quantity cannot be negative']
+    assert body['results']['update'][0]['status'] == 'updated'
+    assert InventoryItem.query.count() == 1
+    assert db.session.get(InventoryItem, milk_id).location is None
+
+
+def test_per_item_errors_are_reported_by_index(user, post_bulk):
+    milk_id = add_item(user)
+
+    status, body = post_bulk({
+        'create': [{'name': 'x' * 101, 'freshness_score': 11}],
+        'update': [{'location': 'fridge'}, {'id': milk_id, 'expiry_date': 'soon'}],
+        'delete': [milk_id, 'abc'],
+    })
+
+    assert status == 400
+    assert body['results']['create'][0]['errors'] == ['name must be at most 100 characters',
+                                                      'freshness_score must be between 1 and 10']
+    assert body['results']['update'][0]['errors'] == ['id is required']
+    assert body['results']['update'][1]['errors'] == ['expiry_date must be an ISO date']
+    assert body['results']['delete'][0]['errors'] == ['Item appears more than once in the batch']
+    assert body['results']['delete'][1] == {'index': 1, 'id': 'abc', 'status': 'invalid', 'errors': ['Item not found']}
+
+
+def test_items_of_other_users_are_not_found(app, post_bulk):
+    other = make_user('other')
+    theirs = add_item(other)
+
+    status, body = post_bulk({'update': [{'id': theirs, 'name': 'mine now'}], 'delete': [theirs]})
+
+    assert status == 400
+    assert body['results']['update'][0]['errors'] == ['Item not found']
+    assert body['results']['delete'][0]['errors'] == ['Item not found']
+    assert db.session.get(InventoryItem, theirs).name == 'milk'
+
+
+def test_boolean_ids_are_rejected(user, post_bulk):
+    milk_id = add_item(user)
+    assert milk_id == 1
+
+    status, body = post_bulk({'update': [{'id': True, 'name': 'cream'}], 'delete': [True]})
+
+    assert status == 400
+    assert body['results']['update'][0]['errors'] == ['id is required']
+    assert body['results']['delete'][0]['status'] == 'invalid'
+    assert db.session.get(InventoryItem, milk_id).name == 'milk'
+
+
+def test_batch_updates_summary_and_leaves_tombstones(user, post_bulk):
+    milk_id = add_item(user, location='fridge')
+    bread_id = add_item(user, name='bread', category='bakery')
+
+    status, body = post_bulk({
+        'create': [{'name': 'apples', 'category': 'fruits', 'location': 'pantry'}],
+        'update': [{'id': milk_id, 'location': 'freezer'}],
+        'delete': [bread_id],
+    })
+
+    assert status == 200
+    assert (body['created'], body['updated'], body['deleted']) == (1, 1, 1)
+    assert body['results']['create'][0]['item']['name'] == 'apples'
+
+    db.session.expire_all()
+    summary = db.session.get(InventorySummary, user.id).to_dict()
+    assert summary['total_items'] == 2
+    assert summary['categories'] == {'dairy': 1, 'fruits': 1}
+    assert summary['locations'] == {'freezer': 1, 'pantry': 1}
+    assert reconcile_users([user.id]) == 0
+
+    tombstones = Tombstone.query.filter_by(user_id=user.id).all()
+    assert [(t.entity, t.entity_id) for t in tombstones] == [('inventory_item', bread_id)]
+
+
+def test_first_batch_creates_the_summary_row(user, post_bulk):
+    status, _ = post_bulk({'create': [{'name': 'rice', 'category': 'grains'}, {'name': 'oats', 'category': 'grains'}]})
+
+    assert status == 200
+    summary = db.session.get(InventorySummary, user.id).to_dict()
+    assert summary['total_items'] == 2
+    assert summary['categories'] == {'grains': 2}
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.main import create_app
+from src.models.user import db, User
+from src.models.inventory import InventoryItem
+from src.models.inventory_summary import InventorySummary
+from src.jobs.summary_reconciler import reconcile_users
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'IMAGE_STORE_DIR': str(tmp_path / 'images'),
+    })
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def user(app):
+    user = User(username='counter', email='counter@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_flush_events_keep_the_summary_in_step(user):
+    expiry = datetime.utcnow() + timedelta(days=1)
+    milk = InventoryItem(user_id=user.id, name='milk', category='dairy', location='fridge', expiry_date=expiry)
+    db.session.add_all([milk, InventoryItem(user_id=user.id, name='rice', category='grains', location='pantry')])
+    db.session.commit()
+
+    milk.location = 'freezer'
+    db.session.commit()
+    summary = db.session.get(InventorySummary, user.id).to_dict()
+    assert summary['total_items'] == 2
+    assert summary['locations'] == {'freezer': 1, 'pantry': 1}
+    assert summary['expiring_soon'] == 1
+
+    db.session.delete(milk)
+    db.session.commit()
+    summary = db.session.get(InventorySummary, user.id).to_dict()
+    assert summary['total_items'] == 1
+    assert summary['categories'] == {'grains': 1}
+    assert summary['expiring_soon'] == 0
+    assert reconcile_users([user.id]) == 0
+
+
+def test_missing_summary_row_is_counted_from_existing_items(user):
+    db.session.add_all([InventoryItem(user_id=user.id, name=f'item {i}', category='pantry') for i in range(50)])
+    db.session.commit()
+    # Items written before summaries existed leave no row behind
+    InventorySummary.query.filter_by(user_id=user.id).delete()
+    db.session.commit()
+
+    db.session.add(InventoryItem(user_id=user.id, name='flour', category='baking'))
+    db.session.commit()
+
+    summary = db.session.get(InventorySummary, user.id)
+    assert summary.total_items == 51
+    assert summary.to_dict()['categories'] == {'baking': 1, 'pantry': 50}
+    assert reconcile_users([user.id]) == 0
@@ -0,0 +1,64 @@
+from flask_sqlalchemy import SQLAlchemy
+from datetime import datetime
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from src.models.user import db
+from src.models.inventory import InventoryItem
+from src.models.preferences import MealPlanItem, ShoppingListItem
+
+# How long deletions are remembered; clients syncing from further back get a full snapshot
+TOMBSTONE_RETENTION_DAYS = 30
+
+class Tombstone(db.Model):
+    """Marker left behind when a synced row is deleted, so clients can drop their copy"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    entity = db.Column(db.String(50), nullable=False)  # table name: inventory_item, meal_plan_item, shopping_list_item
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_tombstone_user_deleted', 'user_id', 'deleted_at'),
+    )
+
+    def __repr__(self):
+        return f'<Tombstone {self.entity} {self.entity_id}>'
+
+    def to_dict(self):
+        return {
+            'entity': self.entity,
+            'entity_id': self.entity_id,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None
+        }
+
+
+# Synced models and how to find the owning user of a row
+TRACKED_MODELS = {
+    InventoryItem: lambda item: item.user_id,
+    MealPlanItem: lambda item: item.meal_plan.user_id,
+    ShoppingListItem: lambda item: item.shopping_list.user_id,
+}
+
+
+def add_tombstones(session, model, user_id, ids):
+    """Record deletions made with bulk statements, which skip flush events"""
+    if ids:
+        now = datetime.utcnow()
+        session.execute(insert(Tombstone), [
+            {'user_id': user_id, 'entity': model.__tablename__, 'entity_id': entity_id, 'deleted_at': now}
+            for entity_id in ids
+        ])
+
+
+@event.listens_for(Session, 'before_flush')
+def _record_tombstones(session, flush_context, instances):
+    """Add a Tombstone for every synced row deleted in this flush"""
+    deleted = [obj for obj in session.deleted if type(obj) in TRACKED_MODELS]
+    if not deleted:
+        return
+
+    with session.no_autoflush:
+        for obj in deleted:
+            user_id = TRACKED_MODELS[type(obj)](obj)
+            if obj.id is not None and user_id is not None:
+                session.add(Tombstone(user_id=user_id, entity=obj.__tablename__, entity_id=obj.id))
@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from src.security import run_password_hash
 
 db = SQLAlchemy()
 
@@ -20,12 +21,12 @@ class User(db.Model):
         return f'<User {self.username}>'
 
     def set_password(self, password):
-        """Hash and set the user's password"""
-        self.password_hash = generate_password_hash(password)
+        """Hash and set the user's password (on the bounded hashing pool)"""
+        self.password_hash = run_password_hash(generate_password_hash, password)
 
     def check_password(self, password):
-        """Check if the provided password matches the user's password"""
-        return check_password_hash(self.password_hash, password)
+        """Check if the provided password matches the user's password (on the bounded hashing pool)"""
+        return run_password_hash(check_password_hash, self.password_hash, password)
 
     def to_dict(self, include_sensitive=False):
         data = {